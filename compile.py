@@ -14,9 +14,12 @@ try:
     import bytecode.writer
     import load_imports
 
+    optimize = '-O' in sys.argv[1:]
+    input_file, output_file = [arg for arg in sys.argv[1:] if arg != '-O']
+
     lib_dir = os.path.join(os.path.dirname(__file__), 'lib')
 
-    entry_module, modules = load_imports.load_imports(lib_dir, sys.argv[1])
+    entry_module, modules = load_imports.load_imports(lib_dir, input_file)
 
     module_interfaces = {}
     for module_name, module in modules:
@@ -31,9 +34,17 @@ try:
         entry_service = evaluation.evaluate_entry_block(modules, entry_module)
         code_generation.generate_entry(writer, entry_service, modules)
 
-    with open(sys.argv[2], 'w') as fd:
+    program = constructor.get_program()
+    if optimize:
+        before = bytecode.optimizer.count_instructions(program)
+        program, inlined = bytecode.optimizer.optimize(program)
+        after = bytecode.optimizer.count_instructions(program)
+        print 'instructions: %d before optimization, %d after' % (before, after)
+        print 'call sites inlined: %d' % inlined
+
+    with open(output_file, 'w') as fd:
         writer = bytecode.writer.BytecodeWriter(fd)
-        bytecode.serialize.serialize_program(writer, constructor.get_program())
+        bytecode.serialize.serialize_program(writer, program)
 except:
     import traceback
     import pdb
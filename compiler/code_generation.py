@@ -301,7 +301,7 @@ def generate_expression(context, expression):
         return context.basic_block.operation(expression.name, arguments)
     elif isinstance(expression, program.TupleConstructor):
         values = [generate_expression(context, value) for value in expression.values]
-        return context.basic_block.operation('list.pack', values)
+        return context.basic_block.tuple(values)
     elif isinstance(expression, program.ListConstructor):
         values = [generate_expression(context, value) for value in expression.values]
         return context.basic_block.operation('list.pack', values)
@@ -322,9 +322,8 @@ def generate_statement(context, statement):
     elif isinstance(statement, program.TupleDestructure):
         var = generate_expression(context, statement.expression)
         for name, i in zip(statement.names, itertools.count()):
-            i_var = context.basic_block.constant_uint(i)
             var, var1 = context.basic_block.dup(var)
-            v = context.basic_block.operation('list.index', [var1, i_var])
+            v = context.basic_block.field(var1, i)
             context.add(name, v)
     elif isinstance(statement, program.Conditional):
         condition_variable = generate_expression(context, statement.expression)
@@ -375,28 +374,25 @@ def generate_statement(context, statement):
     elif isinstance(statement, program.Match):
         var = generate_expression(context, statement.expression)
         var, var1 = context.basic_block.dup(var)
-        zero = context.basic_block.constant_uint(0)
-        name = context.basic_block.operation('list.index', [var1, zero])
+        tag = context.basic_block.field(var1, 0)
+
+        tags = statement.expression.type.constructor.tags
+        switch = context.basic_block.special_switch(tag, [], 0)
+        blocks = [None] * len(tags)
 
         contexts = []
         gotos = []
 
         for clause in statement.clauses:
-            clause_name = context.basic_block.constant_bytestring(clause.name)
-            name, name1 = context.basic_block.dup(name)
-            v = context.basic_block.operation('bytestring.eq', [name1, clause_name])
-            cond = context.basic_block.special_conditional(v, 0, 0)
-
             clause_block = context.function_writer.basic_block()
-            cond.true_block = clause_block.index
+            blocks[tags[clause.name]] = clause_block.index
             clause_context = context.new_context(clause_block)
 
             index = 1
             var1 = var
             for param in clause.parameters:
                 var1, var2 = clause_context.basic_block.dup(var1)
-                index_var = clause_context.basic_block.constant_uint(index)
-                param_var = clause_context.basic_block.operation('list.index', [var2, index_var])
+                param_var = clause_context.basic_block.field(var2, index)
                 clause_context.add(param, param_var)
                 index += 1
 
@@ -410,9 +406,9 @@ def generate_statement(context, statement):
                     gotos.append(clause_context.basic_block.special_goto(0))
                     contexts.append(clause_context)
 
-            context.basic_block = context.function_writer.basic_block()
-            cond.false_block = context.basic_block.index
-
+        context.basic_block = context.function_writer.basic_block()
+        switch.default_block = context.basic_block.index
+        switch.blocks = [switch.default_block if block is None else block for block in blocks]
         context.basic_block.catch_fire_and_die()
 
         if contexts:
@@ -489,8 +485,8 @@ def generate_enum(program_writer, enum):
         name = "%s::%s" % (enum.module_interface.name, constructor.name)
         with program_writer.function(name, len(constructor.types)) as (function_writer, variables):
             with function_writer.basic_block() as basic_block:
-                name = basic_block.constant_bytestring(constructor.name)
-                result = basic_block.operation('list.pack', [name] + variables)
+                tag = basic_block.constant_uint(enum.type_constructor.tags[constructor.name])
+                result = basic_block.tuple([tag] + variables)
                 basic_block.ret(result)
 
 def generate_service_methods(program_writer, service_decl):
@@ -526,6 +522,16 @@ def generate_service_methods(program_writer, service_decl):
                 function_name = "%s.%s#%s" % (name, interface.name, function.name)
                 generate_service_method(function_name, function)
 
+def switch_on_id(basic_block, variable, ids):
+    # Branches to block i + 1 when variable equals ids[i], and to the block
+    # after those otherwise. ids are small and dense, so a table indexed by id
+    # replaces a chain of comparisons.
+    default_block = len(ids) + 1
+    blocks = [default_block] * (max(ids) + 1 if ids else 0)
+    for i, id in enumerate(ids):
+        blocks[id] = i + 1
+    basic_block.switch(variable, blocks, default_block)
+
 def generate_service_instantiations(program_writer, instantiations, service_decl):
     name = service_decl.name
     for instantiation in instantiations:
@@ -534,38 +540,25 @@ def generate_service_instantiations(program_writer, instantiations, service_decl
     for dependency_name in service_decl.dependency_names:
         with program_writer.function("%s^%s" % (service_decl.name, dependency_name), 1) as (function_writer, variables):
             basic_block = function_writer.basic_block()
-            self_variable = variables[0]
-            block = 0
+            switch_on_id(basic_block, variables[0], [instantiation.service_id for instantiation in instantiations])
             for instantiation in instantiations:
-                service_id = basic_block.constant_uint(instantiation.service_id)
-                self_variable, self_variable1 = basic_block.dup(self_variable)
-                v = basic_block.operation('uint.eq', [self_variable1, service_id])
-                basic_block.conditional(v, block + 1, block + 2)
                 basic_block = function_writer.basic_block()
                 result = instantiation.dependencies[dependency_name].interface_variable(basic_block)
                 basic_block.ret(result)
-                basic_block = function_writer.basic_block()
-                block += 2
+            basic_block = function_writer.basic_block()
             basic_block.catch_fire_and_die()
 
     memory_offset = 0
     for attr_name, attr_type in service_decl.type.attrs.iteritems():
         with program_writer.function("%s^%s" % (service_decl.name, attr_name), 1) as (function_writer, variables):
             basic_block = function_writer.basic_block()
-            self_variable = variables[0]
-
-            block = 0
+            switch_on_id(basic_block, variables[0], [instantiation.service_id for instantiation in instantiations])
             for instantiation in instantiations:
                 attr_offset = memory_offset + instantiation.memory_offset
-                service_id = basic_block.constant_uint(instantiation.service_id)
-                self_variable, self_variable1 = basic_block.dup(self_variable)
-                v = basic_block.operation('uint.eq', [self_variable1, service_id])
-                basic_block.conditional(v, block + 1, block + 2)
                 basic_block = function_writer.basic_block()
                 result = basic_block.constant_uint(attr_offset)
                 basic_block.ret(result)
-                basic_block = function_writer.basic_block()
-                block += 2
+            basic_block = function_writer.basic_block()
             basic_block.catch_fire_and_die()
         memory_offset += 1
 
@@ -577,23 +570,14 @@ def generate_interface(program_writer, interface, services):
             basic_block = function_writer.basic_block()
 
             self_var, self_var1 = basic_block.dup(variables[0])
-            zero = basic_block.constant_uint(0)
-            one = basic_block.constant_uint(1)
-
-            self_type = basic_block.operation('list.index', [self_var, zero])
-            self_id = basic_block.operation('list.index', [self_var1, one])
+            self_type = basic_block.field(self_var, 0)
+            self_id = basic_block.field(self_var1, 1)
 
-            block = 0
+            switch_on_id(basic_block, self_type, [service_type_id for service_name, service_type_id in services])
             for service_name, service_type_id in services:
-                self_type, self_type1 = basic_block.dup(self_type)
-
-                service_type = basic_block.constant_uint(service_type_id)
-                v = basic_block.operation('uint.eq', [service_type, self_type1])
-                basic_block.conditional(v, block + 1, block + 2)
                 basic_block = function_writer.basic_block()
                 result = basic_block.fun_call("%s.%s#%s" % (service_name, interface.name, name), [self_id] + variables[1:])
                 basic_block.ret(result)
-                block += 2
 
             basic_block = function_writer.basic_block()
             basic_block.catch_fire_and_die()
@@ -646,6 +630,7 @@ def generate_entry(program_writer, entry_service, modules):
             instantiation.service_type_id = service_type_id
             instantiation.memory_offset = memory_offset
             memory_offset += len(service_decl.type.attrs)
+    program_writer.memory_size(memory_offset)
 
     for name, instantiations in grouped_services.iteritems():
         service_decl = service_decls[name]
@@ -0,0 +1,157 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+_tabversion = '3.8'
+
+_lr_method = 'LALR'
+
+_lr_signature = '14AC27BD35955A79315DAA84BE793494'
+    
+_lr_action_items = {'DO':([13,23,24,34,37,38,39,42,46,50,52,58,85,87,101,102,108,114,139,141,143,150,155,161,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,204,206,207,210,213,214,215,226,229,231,234,236,237,241,249,250,252,253,254,257,258,259,260,261,263,274,276,277,280,289,290,297,298,301,309,],[-128,34,-63,-128,-88,-85,-84,-86,-64,-89,-83,-87,-82,-92,-93,-101,-114,-71,-54,-56,-52,-98,-99,-90,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,-72,-94,-96,236,-128,-73,-65,249,-55,-57,-97,-128,-70,-100,-128,-53,-80,-95,-74,-81,-128,-76,-75,-128,280,-79,289,-120,-128,-128,-77,-128,-121,-128,-78,]),'RETURN':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,35,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'ARROW':([136,139,141,143,217,229,231,250,264,],[192,-54,-56,-52,242,-55,-57,-53,281,]),'SERVICE':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,-2,8,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'RESUME':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,36,-63,-128,36,36,36,-64,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-71,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-72,36,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,36,-128,-128,-77,-128,-128,-78,]),'ASSIGNMENT':([40,60,156,],[90,107,209,]),'VOID':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,37,-63,-128,37,37,37,-64,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,-71,37,37,37,37,37,37,37,37,37,37,37,37,37,37,-72,37,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,37,-128,-128,-77,-128,-128,-78,]),'CONSTRUCTOR':([132,187,188,224,271,294,296,308,],[-128,225,-41,-42,-45,-46,-43,-44,]),'NUMBER':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,38,-63,-128,38,38,38,-64,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-71,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-72,38,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,38,-128,-128,-77,-128,-128,-78,]),'CHAR':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,39,-63,-128,39,39,39,-64,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-71,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-72,39,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,39,-128,-128,-77,-128,-128,-78,]),'IMPLEMENTS':([132,187,188,224,271,294,296,308,],[-128,220,-41,-42,-45,-46,-43,-44,]),'WHILE':([23,24,34,46,48,49,84,86,114,147,179,204,214,237,252,254,257,259,260,274,290,309,],[-128,-63,-128,-64,-127,-62,146,-124,-71,-125,-126,-72,-73,-70,-80,-74,-81,-76,-75,-79,-77,-78,]),'COLON':([37,38,39,40,42,50,52,58,60,61,71,77,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,245,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,118,133,137,-82,-92,118,118,118,-93,-101,-114,118,118,118,-98,118,118,-99,118,118,118,-90,118,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,118,-94,-96,118,118,-65,118,118,-97,118,-100,268,-95,118,]),'LOWER_NAME':([5,9,13,14,21,23,24,26,27,28,29,34,35,41,45,46,51,53,54,59,62,64,65,66,67,80,82,89,90,95,96,99,103,104,105,107,109,110,111,112,113,114,115,116,117,119,120,121,122,123,124,128,129,133,134,135,137,142,151,154,157,172,181,183,185,186,192,194,196,201,202,203,204,209,212,213,214,218,220,222,225,230,236,237,238,239,242,249,252,254,256,257,259,260,261,266,268,272,274,275,279,280,281,289,290,297,299,301,303,306,309,],[17,20,-128,25,32,40,-63,-128,68,71,77,-128,85,85,85,-64,100,85,85,106,85,77,-128,131,-15,32,143,85,85,85,85,156,85,85,85,85,85,85,85,167,85,-71,85,85,85,85,85,85,85,85,85,184,-38,143,71,77,143,143,85,85,85,143,143,-39,-16,219,143,143,143,68,85,85,-72,85,-128,-128,-73,143,17,245,248,143,-128,-70,-117,258,143,-128,-80,-74,-118,-81,-76,-75,-128,143,143,77,-79,288,85,-128,143,-128,-77,-128,305,-128,-40,-119,-78,]),'OPEN_SQUARE':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,41,-63,-128,41,41,41,-64,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,-71,41,41,41,41,41,41,41,41,41,41,41,41,41,41,-72,41,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,41,-128,-128,-77,-128,-128,-78,]),'MUL':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,109,-82,-92,109,109,109,109,-101,-114,109,109,109,-98,109,109,-99,109,109,109,-90,109,-104,-105,109,-116,-115,109,109,109,109,109,109,109,109,109,-91,109,-94,-96,109,109,-65,109,109,-97,109,-100,-95,109,]),'CLOSE_SQUARE':([37,38,39,41,42,50,52,58,85,87,91,92,93,94,101,102,108,150,155,161,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,215,234,241,253,],[-88,-85,-84,-128,-86,-89,-83,-87,-82,-92,150,-66,-67,-68,-93,-101,-114,-98,-99,-90,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,-69,-94,-96,-65,-97,-100,-95,]),'TRUE':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,42,-63,-128,42,42,42,-64,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-71,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-72,42,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,42,-128,-128,-77,-128,-128,-78,]),'DIV':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,110,-82,-92,110,110,110,110,-101,-114,110,110,110,-98,110,110,-99,110,110,110,-90,110,-104,-105,110,-116,-115,110,110,110,110,110,110,110,110,110,-91,110,-94,-96,110,110,-65,110,110,-97,110,-100,-95,110,]),'DOT':([17,18,37,38,39,40,42,50,52,58,60,61,68,85,87,88,94,98,101,102,108,125,143,144,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-5,27,-88,-85,-84,-82,-86,-89,-83,-87,-92,112,-6,-82,-92,112,112,112,112,-101,-114,112,-5,201,112,112,-98,112,112,-99,112,112,112,-90,112,112,112,112,-116,-115,112,112,112,112,112,112,112,112,112,-91,112,-94,-96,112,112,-65,112,112,-97,112,-100,-95,112,]),'LE':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,113,-82,-92,113,113,113,113,-101,-114,113,113,113,-98,113,113,-99,113,113,113,-90,113,-104,-105,-103,-116,-115,None,None,None,-102,113,None,None,None,113,-91,113,-94,-96,113,113,-65,113,113,-97,113,-100,-95,113,]),'ATTR':([132,187,188,224,271,294,296,308,],[-128,222,-41,-42,-45,-46,-43,-44,]),'SEMICOLON':([35,37,38,39,40,42,50,52,58,60,61,85,87,88,101,102,108,125,139,141,143,149,150,155,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,206,207,211,215,229,231,234,235,241,250,253,284,293,],[86,-88,-85,-84,-82,-86,-89,-83,-87,-92,114,-82,-92,147,-93,-101,-114,179,-54,-56,-52,204,-98,-99,-90,214,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,-94,-96,237,-65,-55,-57,-97,254,-100,-53,-95,296,303,]),'RUN':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,43,-63,-128,43,43,43,-64,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-71,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-72,43,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,43,-128,-128,-77,-128,-128,-78,]),'IS_DONE':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,44,-63,-128,44,44,44,-64,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,-71,44,44,44,44,44,44,44,44,44,44,44,44,44,44,-72,44,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,44,-128,-128,-77,-128,-128,-78,]),'NE':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,115,-82,-92,115,115,115,115,-101,-114,115,115,115,-98,115,115,-99,115,115,115,-90,115,-104,-105,-103,-116,-115,None,None,None,-102,115,None,None,None,115,-91,115,-94,-96,115,115,-65,115,115,-97,115,-100,-95,115,]),'PRIVATE':([132,187,188,224,271,294,296,308,],[-128,223,-41,-42,-45,-46,-43,-44,]),'MINUS':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,111,-82,-92,111,111,111,111,-101,-114,111,111,111,-98,111,111,-99,111,111,111,-90,111,-104,-105,-103,-116,-115,111,111,111,-102,111,111,111,111,111,-91,111,-94,-96,111,111,-65,111,111,-97,111,-100,-95,111,]),'PIPE':([30,31,32,81,83,138,195,],[-19,80,-128,-21,-22,-20,-23,]),'LT':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,116,-82,-92,116,116,116,116,-101,-114,116,116,116,-98,116,116,-99,116,116,116,-90,116,-104,-105,-103,-116,-115,None,None,None,-102,116,None,None,None,116,-91,116,-94,-96,116,116,-65,116,116,-97,116,-100,-95,116,]),'OPEN_PARENS':([13,19,20,23,24,25,26,32,34,35,36,37,38,39,40,41,42,43,44,45,46,50,52,53,54,55,56,57,58,60,61,62,82,85,87,88,89,90,94,95,96,98,101,102,103,104,105,106,107,108,109,110,111,113,114,115,116,117,118,119,120,121,122,123,124,125,126,133,137,139,141,142,146,148,149,150,151,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,168,169,170,172,173,174,175,176,177,178,180,181,184,192,194,196,202,203,204,205,206,207,208,209,210,213,214,215,218,230,231,232,233,234,235,236,237,241,242,244,248,249,252,253,254,257,258,259,260,261,262,266,268,274,279,280,281,289,290,291,297,301,309,],[-128,28,29,45,-63,64,66,82,-128,45,89,-88,-85,-84,-82,45,-86,95,96,45,-64,-89,-83,45,45,103,104,105,-87,-92,117,45,142,-82,-92,117,45,45,117,45,45,117,117,117,45,45,45,117,45,-114,45,45,45,45,-71,45,45,45,172,45,45,45,45,45,45,117,117,142,142,194,-56,142,202,117,117,-98,45,117,117,45,-99,45,117,117,117,-90,117,117,117,117,-116,-115,117,117,117,142,117,117,117,117,117,117,-91,142,218,142,142,142,45,45,-72,117,-94,-96,117,45,117,-128,-73,-65,142,142,-57,117,117,-97,117,-128,-70,-100,142,266,272,-128,-80,-95,-74,-81,275,-76,-75,-128,279,142,142,-79,45,-128,142,-128,-77,117,-128,-128,-78,]),'PLUS':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,119,-82,-92,119,119,119,119,-101,-114,119,119,119,-98,119,119,-99,119,119,119,-90,119,-104,-105,-103,-116,-115,119,119,119,-102,119,119,119,119,119,-91,119,-94,-96,119,119,-65,119,119,-97,119,-100,-95,119,]),'IMPORT':([0,1,3,6,17,18,68,],[-128,5,-2,-3,-5,-4,-6,]),'DEFINE':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,141,182,221,223,231,244,246,247,265,267,269,270,282,286,295,302,],[-128,-128,-2,9,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-56,-12,-13,-128,-57,-128,-49,9,-128,-47,-51,-50,9,-26,-48,-27,]),'AND':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,120,-82,-92,120,120,120,120,-101,-114,120,120,120,-98,120,120,-99,120,120,120,-90,120,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,120,-94,-96,120,120,-65,120,120,-97,120,-100,-95,120,]),'GT':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,121,-82,-92,121,121,121,121,-101,-114,121,121,121,-98,121,121,-99,121,121,121,-90,121,-104,-105,-103,-116,-115,None,None,None,-102,121,None,None,None,121,-91,121,-94,-96,121,121,-65,121,121,-97,121,-100,-95,121,]),'END':([13,22,23,24,26,30,31,32,46,48,49,65,67,81,83,86,114,128,129,132,138,141,147,179,183,185,187,188,195,204,212,213,214,223,224,231,236,237,238,239,240,244,246,247,249,252,254,255,256,257,259,260,261,265,267,269,270,271,273,274,278,280,282,286,289,290,292,294,295,296,297,300,301,303,304,306,307,308,309,],[-128,33,-128,-63,-128,-19,79,-128,-64,-127,-62,-128,-15,-21,-22,-124,-71,182,-38,-128,-20,-56,-125,-126,-39,-16,221,-41,-23,-72,-128,-128,-73,-128,-42,-57,-128,-70,-117,257,259,-128,-49,271,-128,-80,-74,274,-118,-81,-76,-75,-128,-128,-47,-51,-50,-45,286,-79,290,-128,294,-26,-128,-77,302,-46,-48,-43,-128,306,-128,-40,308,-119,259,-44,-78,]),'STRING':([13,23,24,34,35,41,45,46,53,54,62,63,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,50,-63,-128,50,50,50,-64,50,50,50,126,50,50,50,50,50,50,50,50,50,50,50,50,-71,50,50,50,50,50,50,50,50,50,50,50,50,50,50,-72,50,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,50,-128,-128,-77,-128,-128,-78,]),'FOR':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,51,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'ENUM':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,-2,12,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'UPPER_NAME':([8,12,13,16,23,24,34,35,41,45,46,53,54,62,82,89,90,95,96,103,104,105,107,109,110,111,112,113,114,115,116,117,119,120,121,122,123,124,133,137,142,151,154,157,172,181,192,194,196,201,202,203,204,209,213,214,218,220,230,236,237,242,249,252,254,257,259,260,261,266,268,274,279,280,281,289,290,297,301,309,],[19,21,-128,26,52,-63,-128,52,52,52,-64,52,52,52,141,52,52,52,52,52,52,52,52,52,52,52,166,52,-71,52,52,52,52,52,52,52,52,52,141,141,141,52,52,52,141,141,141,141,141,231,52,52,-72,52,-128,-73,141,141,141,-128,-70,141,-128,-80,-74,-81,-76,-75,-128,141,141,-79,52,-128,141,-128,-77,-128,-128,-78,]),'YIELD':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,53,-63,-128,53,53,53,-64,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,-71,53,53,53,53,53,53,53,53,53,53,53,53,53,53,-72,53,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,53,-128,-128,-77,-128,-128,-78,]),'ELSE':([23,24,46,48,49,86,114,147,179,204,213,214,237,240,252,254,257,259,260,274,290,301,307,309,],[-128,-63,-64,-127,-62,-124,-71,-125,-126,-72,-128,-73,-70,261,-80,-74,-81,-76,-75,-79,-77,-128,261,-78,]),'COMMA':([37,38,39,40,42,47,50,52,58,69,73,74,76,85,87,93,94,97,98,101,102,108,130,131,139,140,141,143,145,148,150,155,156,161,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,189,190,191,193,198,199,205,206,207,208,215,219,227,228,229,231,234,241,250,251,253,283,287,288,305,],[-88,-85,-84,-122,-86,99,-89,-83,-87,-30,134,135,-35,-82,-92,151,-68,154,-68,-93,-101,-114,186,-17,-54,196,-56,-52,-24,203,-98,-99,-123,-90,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,-32,-31,-36,-37,230,-60,-69,-94,-96,-69,-65,-18,230,-25,-55,-57,-97,-100,-53,-61,-95,230,299,-122,-123,]),'NOT':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,54,-63,-128,54,54,54,-64,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,-71,54,54,54,54,54,54,54,54,54,54,54,54,54,54,-72,54,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,54,-128,-128,-77,-128,-128,-78,]),'GE':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,122,-82,-92,122,122,122,122,-101,-114,122,122,122,-98,122,122,-99,122,122,122,-90,122,-104,-105,-103,-116,-115,None,None,None,-102,122,None,None,None,122,-91,122,-94,-96,122,122,-65,122,122,-97,122,-100,-95,122,]),'ELSIF':([23,24,46,48,49,86,114,147,179,204,213,214,237,240,252,254,257,259,260,274,290,301,307,309,],[-128,-63,-64,-127,-62,-124,-71,-125,-126,-72,-128,-73,-70,262,-80,-74,-81,-76,-75,-79,-77,-128,262,-78,]),'IN':([100,],[157,]),'DEBUG':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,55,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'ENTRY':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,-2,13,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'EQ':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,123,-82,-92,123,123,123,123,-101,-114,123,123,123,-98,123,123,-99,123,123,123,-90,123,-104,-105,-103,-116,-115,None,None,None,-102,123,None,None,None,123,-91,123,-94,-96,123,123,-65,123,123,-97,123,-100,-95,123,]),'MATCH':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,56,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'IF':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,57,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'CLOSE_PARENS':([28,29,37,38,39,42,50,52,58,64,69,70,72,73,74,75,76,78,85,87,92,93,94,98,101,102,108,117,127,130,131,139,140,141,142,143,145,150,152,153,155,158,159,160,161,163,164,165,166,167,168,169,170,171,173,174,175,176,177,178,180,189,190,191,193,197,198,199,200,205,206,207,208,215,216,218,219,227,228,229,231,232,233,234,241,243,250,251,253,272,283,285,287,288,291,305,],[-128,-128,-88,-85,-84,-86,-89,-83,-87,-128,-30,132,-28,-29,-34,136,-35,-33,-82,-92,-66,-67,-68,155,-93,-101,-114,-128,181,185,-17,-54,195,-56,-128,-52,-24,-98,206,207,-99,211,212,213,-90,-104,-105,-103,-116,-115,-107,-111,-106,215,-102,-113,-108,-109,-110,-112,-91,-32,-31,-36,-37,229,-59,-60,-58,-69,-94,-96,234,-65,241,-128,-18,250,-25,-55,-57,252,253,-97,-100,264,-53,-61,-95,-128,295,297,298,-122,301,-123,]),'PROPERTY':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,60,-63,-128,87,87,87,-64,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,-71,87,87,87,87,87,87,87,87,87,87,87,87,87,87,-72,87,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,87,-128,-128,-77,-128,-128,-78,]),'FALSE':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,58,-63,-128,58,58,58,-64,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,-71,58,58,58,58,58,58,58,58,58,58,58,58,58,58,-72,58,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,58,-128,-128,-77,-128,-128,-78,]),'COROUTINE':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,-2,14,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'OR':([37,38,39,40,42,50,52,58,60,61,85,87,88,94,98,101,102,108,125,148,149,150,152,153,155,158,159,160,161,162,163,164,165,166,167,168,169,170,173,174,175,176,177,178,180,205,206,207,208,210,215,232,233,234,235,241,253,291,],[-88,-85,-84,-82,-86,-89,-83,-87,-92,124,-82,-92,124,124,124,124,-101,-114,124,124,124,-98,124,124,-99,124,124,124,-90,124,-104,-105,-103,-116,-115,-107,-111,-106,-102,-113,-108,-109,-110,-112,-91,124,-94,-96,124,124,-65,124,124,-97,124,-100,-95,124,]),'SYS':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,59,-63,-128,59,59,59,-64,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,-71,59,59,59,59,59,59,59,59,59,59,59,59,59,59,-72,59,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,59,-128,-128,-77,-128,-128,-78,]),'INTERFACE':([0,1,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,-2,16,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'$end':([0,1,2,3,4,6,7,10,11,15,17,18,33,68,79,182,221,286,302,],[-128,-128,0,-2,-1,-3,-7,-9,-10,-8,-5,-4,-14,-6,-11,-12,-13,-26,-27,]),'THROW':([13,23,24,34,46,114,204,213,214,236,237,249,252,254,257,259,260,261,274,280,289,290,297,301,309,],[-128,62,-63,-128,-64,-71,-72,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,-128,-128,-77,-128,-128,-78,]),'OP':([13,23,24,34,35,41,45,46,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,114,115,116,117,119,120,121,122,123,124,151,154,157,202,203,204,209,213,214,236,237,249,252,254,257,259,260,261,274,279,280,289,290,297,301,309,],[-128,63,-63,-128,63,63,63,-64,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,-71,63,63,63,63,63,63,63,63,63,63,63,63,63,63,-72,63,-128,-73,-128,-70,-128,-80,-74,-81,-76,-75,-128,-79,63,-128,-128,-77,-128,-128,-78,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'named_type':([82,133,137,142,172,181,192,194,196,218,220,230,242,266,268,281,],[139,139,139,139,139,139,139,139,139,139,244,139,139,139,139,139,]),'non_empty_type_parameters':([66,],[130,]),'imports':([0,],[1,]),'service_decl_list':([132,],[187,]),'import_decl':([1,],[6,]),'if_end':([240,307,],[260,309,]),'function_call':([61,88,94,98,101,102,106,125,126,148,149,152,153,158,159,160,162,163,164,165,168,169,170,173,174,175,176,177,178,205,208,210,232,233,235,291,],[108,108,108,108,108,108,161,108,180,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,108,]),'enum_constructors':([21,],[31,]),'match_list':([258,],[276,]),'enum_type_list':([32,],[81,]),'optional_type_list':([244,],[265,]),'program':([0,],[2,]),'non_empty_match_list':([23,275,],[47,287,]),'argument_list':([41,117,],[91,171,]),'statement':([23,],[46,]),'parameter':([29,64,135,272,],[76,76,191,76,]),'empty':([0,1,13,23,26,28,29,32,34,41,64,65,117,132,142,212,213,218,223,236,244,249,258,261,265,272,280,289,297,301,],[3,7,24,48,67,72,78,83,24,92,78,129,92,188,200,238,24,200,246,24,267,24,277,24,246,78,24,24,24,24,]),'service_method_list':([223,265,],[247,282,]),'function':([4,247,282,],[10,269,269,]),'match_clause':([239,],[256,]),'enum_constructor':([21,80,],[30,138,]),'block_end':([23,],[49,]),'coroutine':([4,],[11,]),'type_parameters':([26,],[65,]),'non_empty_enum_type_list':([82,],[140,]),'type_list':([142,218,],[197,243,]),'dependencies':([28,],[70,]),'top_level_decls':([1,],[4,]),'interface_decl_list':([65,],[128,]),'match_clauses':([212,],[239,]),'non_empty_argument_list':([41,45,117,],[93,97,93,]),'service_method':([247,282,],[270,270,]),'non_empty_parameter_list':([29,64,272,],[74,74,74,]),'code_block':([13,34,213,236,249,261,280,289,297,301,],[22,84,240,255,273,278,292,300,304,307,]),'interface_decl':([128,],[183,]),'parameter_list':([29,64,272,],[75,127,285,]),'type':([82,133,137,142,172,181,192,194,196,218,230,242,266,268,281,],[145,189,193,199,216,217,226,199,228,199,251,263,199,284,293,]),'dependency':([28,134,],[69,190,]),'service_decl':([187,],[224,]),'top_level_decl':([4,],[15,]),'statement_list':([13,34,213,236,249,261,280,289,297,301,],[23,23,23,23,23,23,23,23,23,23,]),'module_name':([5,82,133,137,142,172,181,192,194,196,218,220,230,242,266,268,281,],[18,144,144,144,144,144,144,144,144,144,144,144,144,144,144,144,144,]),'non_empty_type_list':([142,194,218,266,],[198,227,198,283,]),'expression':([23,35,41,45,53,54,62,89,90,95,96,103,104,105,107,109,110,111,113,115,116,117,119,120,121,122,123,124,151,154,157,202,203,209,279,],[61,88,94,98,101,102,125,148,149,152,153,158,159,160,162,163,164,165,168,169,170,94,173,174,175,176,177,178,205,208,210,232,233,235,291,]),'non_empty_dependencies':([28,],[73,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> imports top_level_decls','program',2,'p_program_empty','parse.py',8),
+  ('imports -> empty','imports',1,'p_imports_empty','parse.py',12),
+  ('imports -> imports import_decl','imports',2,'p_imports','parse.py',16),
+  ('import_decl -> IMPORT module_name','import_decl',2,'p_import','parse.py',21),
+  ('module_name -> LOWER_NAME','module_name',1,'p_module_name_initial','parse.py',25),
+  ('module_name -> module_name DOT LOWER_NAME','module_name',3,'p_module_name','parse.py',29),
+  ('top_level_decls -> empty','top_level_decls',1,'p_top_level_decls_empty','parse.py',33),
+  ('top_level_decls -> top_level_decls top_level_decl','top_level_decls',2,'p_top_level_decls','parse.py',37),
+  ('top_level_decl -> function','top_level_decl',1,'p_top_level_function','parse.py',42),
+  ('top_level_decl -> coroutine','top_level_decl',1,'p_top_level_coroutine','parse.py',46),
+  ('top_level_decl -> ENUM UPPER_NAME enum_constructors END','top_level_decl',4,'p_enum','parse.py',50),
+  ('top_level_decl -> INTERFACE UPPER_NAME type_parameters interface_decl_list END','top_level_decl',5,'p_interface','parse.py',54),
+  ('top_level_decl -> SERVICE UPPER_NAME OPEN_PARENS dependencies CLOSE_PARENS service_decl_list END','top_level_decl',7,'p_service','parse.py',58),
+  ('top_level_decl -> ENTRY code_block END','top_level_decl',3,'p_entry','parse.py',62),
+  ('type_parameters -> empty','type_parameters',1,'p_type_parameters_empty','parse.py',66),
+  ('type_parameters -> OPEN_PARENS non_empty_type_parameters CLOSE_PARENS','type_parameters',3,'p_type_parameters','parse.py',70),
+  ('non_empty_type_parameters -> LOWER_NAME','non_empty_type_parameters',1,'p_non_empty_type_parameters_initial','parse.py',74),
+  ('non_empty_type_parameters -> non_empty_type_parameters COMMA LOWER_NAME','non_empty_type_parameters',3,'p_non_empty_type_parameters','parse.py',78),
+  ('enum_constructors -> enum_constructor','enum_constructors',1,'p_enum_constructors_initial','parse.py',83),
+  ('enum_constructors -> enum_constructors PIPE enum_constructor','enum_constructors',3,'p_enum_constructors','parse.py',87),
+  ('enum_constructor -> LOWER_NAME enum_type_list','enum_constructor',2,'p_enum_constructor','parse.py',92),
+  ('enum_type_list -> empty','enum_type_list',1,'p_empty_enum_type_list','parse.py',96),
+  ('enum_type_list -> OPEN_PARENS non_empty_enum_type_list CLOSE_PARENS','enum_type_list',3,'p_non_empty_enum_type_list','parse.py',100),
+  ('non_empty_enum_type_list -> type','non_empty_enum_type_list',1,'p_enum_type_list_initial','parse.py',104),
+  ('non_empty_enum_type_list -> non_empty_enum_type_list COMMA type','non_empty_enum_type_list',3,'p_enum_type_list','parse.py',108),
+  ('function -> DEFINE LOWER_NAME OPEN_PARENS parameter_list CLOSE_PARENS ARROW type DO code_block END','function',10,'p_function','parse.py',113),
+  ('coroutine -> COROUTINE LOWER_NAME OPEN_PARENS parameter_list CLOSE_PARENS type ARROW type DO code_block END','coroutine',11,'p_coroutine','parse.py',117),
+  ('dependencies -> empty','dependencies',1,'p_dependencies_empty','parse.py',121),
+  ('dependencies -> non_empty_dependencies','dependencies',1,'p_dependencies','parse.py',125),
+  ('non_empty_dependencies -> dependency','non_empty_dependencies',1,'p_non_empty_dependencies_initial','parse.py',129),
+  ('non_empty_dependencies -> non_empty_dependencies COMMA dependency','non_empty_dependencies',3,'p_non_empty_dependencies','parse.py',133),
+  ('dependency -> LOWER_NAME COLON type','dependency',3,'p_dependency','parse.py',138),
+  ('parameter_list -> empty','parameter_list',1,'p_parameter_list_empty','parse.py',142),
+  ('parameter_list -> non_empty_parameter_list','parameter_list',1,'p_parameter_list','parse.py',146),
+  ('non_empty_parameter_list -> parameter','non_empty_parameter_list',1,'p_non_empty_parameter_list_initial','parse.py',150),
+  ('non_empty_parameter_list -> non_empty_parameter_list COMMA parameter','non_empty_parameter_list',3,'p_non_empty_parameter_list','parse.py',154),
+  ('parameter -> LOWER_NAME COLON type','parameter',3,'p_parameter','parse.py',159),
+  ('interface_decl_list -> empty','interface_decl_list',1,'p_interface_decl_list_empty','parse.py',163),
+  ('interface_decl_list -> interface_decl_list interface_decl','interface_decl_list',2,'p_interface_decl_list','parse.py',167),
+  ('interface_decl -> LOWER_NAME OPEN_PARENS type_list CLOSE_PARENS ARROW type SEMICOLON','interface_decl',7,'p_interface_decl','parse.py',172),
+  ('service_decl_list -> empty','service_decl_list',1,'p_service_decl_list_empty','parse.py',176),
+  ('service_decl_list -> service_decl_list service_decl','service_decl_list',2,'p_service_decl_list','parse.py',180),
+  ('service_decl -> ATTR LOWER_NAME COLON type SEMICOLON','service_decl',5,'p_service_decl_attr','parse.py',185),
+  ('service_decl -> CONSTRUCTOR LOWER_NAME OPEN_PARENS parameter_list CLOSE_PARENS code_block END','service_decl',7,'p_service_decl_constructor','parse.py',189),
+  ('service_decl -> PRIVATE service_method_list END','service_decl',3,'p_service_decl_private','parse.py',193),
+  ('service_decl -> IMPLEMENTS named_type optional_type_list service_method_list END','service_decl',5,'p_service_decl_implements','parse.py',197),
+  ('optional_type_list -> empty','optional_type_list',1,'p_optional_type_list_empty','parse.py',201),
+  ('optional_type_list -> OPEN_PARENS non_empty_type_list CLOSE_PARENS','optional_type_list',3,'p_optional_type_list','parse.py',205),
+  ('service_method_list -> empty','service_method_list',1,'p_service_method_list_empty','parse.py',209),
+  ('service_method_list -> service_method_list service_method','service_method_list',2,'p_service_method_list','parse.py',213),
+  ('service_method -> function','service_method',1,'p_service_method','parse.py',218),
+  ('type -> LOWER_NAME','type',1,'p_type_variable','parse.py',222),
+  ('type -> named_type OPEN_PARENS non_empty_type_list CLOSE_PARENS','type',4,'p_instantiation','parse.py',226),
+  ('type -> named_type','type',1,'p_named_type','parse.py',230),
+  ('type -> OPEN_PARENS type_list CLOSE_PARENS','type',3,'p_type_tuple','parse.py',234),
+  ('named_type -> UPPER_NAME','named_type',1,'p_type_named','parse.py',238),
+  ('named_type -> module_name DOT UPPER_NAME','named_type',3,'p_type_named_qualified','parse.py',242),
+  ('type_list -> empty','type_list',1,'p_empty_type_list','parse.py',246),
+  ('type_list -> non_empty_type_list','type_list',1,'p_non_empty_type_list','parse.py',250),
+  ('non_empty_type_list -> type','non_empty_type_list',1,'p_type_list_initial','parse.py',254),
+  ('non_empty_type_list -> non_empty_type_list COMMA type','non_empty_type_list',3,'p_type_list','parse.py',258),
+  ('code_block -> statement_list block_end','code_block',2,'p_code_block','parse.py',263),
+  ('statement_list -> empty','statement_list',1,'p_statement_list_empty','parse.py',267),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parse.py',271),
+  ('function_call -> OPEN_PARENS argument_list CLOSE_PARENS','function_call',3,'p_function_call','parse.py',276),
+  ('argument_list -> empty','argument_list',1,'p_argument_list_empty','parse.py',280),
+  ('argument_list -> non_empty_argument_list','argument_list',1,'p_argument_list','parse.py',284),
+  ('non_empty_argument_list -> expression','non_empty_argument_list',1,'p_non_empty_argument_list_initial','parse.py',288),
+  ('non_empty_argument_list -> non_empty_argument_list COMMA expression','non_empty_argument_list',3,'p_non_empty_argument_list','parse.py',292),
+  ('statement -> DEBUG OPEN_PARENS expression CLOSE_PARENS SEMICOLON','statement',5,'p_debug','parse.py',297),
+  ('statement -> expression SEMICOLON','statement',2,'p_function_call_statement','parse.py',301),
+  ('statement -> LOWER_NAME ASSIGNMENT expression SEMICOLON','statement',4,'p_assignment_statement','parse.py',305),
+  ('statement -> PROPERTY ASSIGNMENT expression SEMICOLON','statement',4,'p_attr_assignment','parse.py',309),
+  ('statement -> non_empty_match_list COMMA LOWER_NAME ASSIGNMENT expression SEMICOLON','statement',6,'p_tuple_assignment','parse.py',313),
+  ('statement -> IF OPEN_PARENS expression CLOSE_PARENS code_block if_end','statement',6,'p_conditional','parse.py',318),
+  ('if_end -> END','if_end',1,'p_condition_end','parse.py',322),
+  ('if_end -> ELSE code_block END','if_end',3,'p_else','parse.py',326),
+  ('if_end -> ELSIF OPEN_PARENS expression CLOSE_PARENS code_block if_end','if_end',6,'p_elif','parse.py',330),
+  ('statement -> FOR LOWER_NAME IN expression DO code_block END','statement',7,'p_for','parse.py',334),
+  ('statement -> DO code_block WHILE OPEN_PARENS expression CLOSE_PARENS','statement',6,'p_while','parse.py',338),
+  ('statement -> MATCH OPEN_PARENS expression CLOSE_PARENS match_clauses END','statement',6,'p_match','parse.py',342),
+  ('expression -> LOWER_NAME','expression',1,'p_expression_variable','parse.py',346),
+  ('expression -> UPPER_NAME','expression',1,'p_expression_type_name','parse.py',350),
+  ('expression -> CHAR','expression',1,'p_expression_char','parse.py',354),
+  ('expression -> NUMBER','expression',1,'p_expression_number','parse.py',358),
+  ('expression -> TRUE','expression',1,'p_expression_true','parse.py',362),
+  ('expression -> FALSE','expression',1,'p_expression_false','parse.py',366),
+  ('expression -> VOID','expression',1,'p_expression_void','parse.py',370),
+  ('expression -> STRING','expression',1,'p_expression_string','parse.py',374),
+  ('expression -> SYS LOWER_NAME function_call','expression',3,'p_expression_sys_call','parse.py',378),
+  ('expression -> OP STRING function_call','expression',3,'p_expression_op_call','parse.py',382),
+  ('expression -> PROPERTY','expression',1,'p_expression_attr','parse.py',386),
+  ('expression -> YIELD expression','expression',2,'p_expression_yield','parse.py',390),
+  ('expression -> RUN OPEN_PARENS expression CLOSE_PARENS','expression',4,'p_expression_run','parse.py',394),
+  ('expression -> RESUME OPEN_PARENS expression COMMA expression CLOSE_PARENS','expression',6,'p_expression_resume','parse.py',398),
+  ('expression -> IS_DONE OPEN_PARENS expression CLOSE_PARENS','expression',4,'p_expression_is_done','parse.py',402),
+  ('expression -> OPEN_PARENS non_empty_argument_list COMMA expression CLOSE_PARENS','expression',5,'p_expression_tuple','parse.py',406),
+  ('expression -> OPEN_SQUARE argument_list CLOSE_SQUARE','expression',3,'p_expression_list','parse.py',411),
+  ('expression -> OPEN_PARENS expression CLOSE_PARENS','expression',3,'p_bracketed_expr','parse.py',415),
+  ('expression -> expression COLON OPEN_PARENS type CLOSE_PARENS','expression',5,'p_annotation','parse.py',431),
+  ('expression -> NOT expression','expression',2,'p_expression_not','parse.py',435),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parse.py',439),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parse.py',440),
+  ('expression -> expression MUL expression','expression',3,'p_expression_binop','parse.py',441),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parse.py',442),
+  ('expression -> expression LT expression','expression',3,'p_expression_binop','parse.py',443),
+  ('expression -> expression LE expression','expression',3,'p_expression_binop','parse.py',444),
+  ('expression -> expression GT expression','expression',3,'p_expression_binop','parse.py',445),
+  ('expression -> expression GE expression','expression',3,'p_expression_binop','parse.py',446),
+  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parse.py',447),
+  ('expression -> expression NE expression','expression',3,'p_expression_binop','parse.py',448),
+  ('expression -> expression OR expression','expression',3,'p_expression_binop','parse.py',449),
+  ('expression -> expression AND expression','expression',3,'p_expression_binop','parse.py',450),
+  ('expression -> expression function_call','expression',2,'p_call','parse.py',454),
+  ('expression -> expression DOT LOWER_NAME','expression',3,'p_record_access','parse.py',458),
+  ('expression -> expression DOT UPPER_NAME','expression',3,'p_type_access','parse.py',462),
+  ('match_clauses -> empty','match_clauses',1,'p_clauses_empty','parse.py',466),
+  ('match_clauses -> match_clauses match_clause','match_clauses',2,'p_clauses','parse.py',470),
+  ('match_clause -> LOWER_NAME match_list DO code_block END','match_clause',5,'p_clause','parse.py',475),
+  ('match_list -> empty','match_list',1,'p_match_list_empty','parse.py',479),
+  ('match_list -> OPEN_PARENS non_empty_match_list CLOSE_PARENS','match_list',3,'p_match_list','parse.py',483),
+  ('non_empty_match_list -> LOWER_NAME','non_empty_match_list',1,'p_non_empty_match_list_initial','parse.py',487),
+  ('non_empty_match_list -> non_empty_match_list COMMA LOWER_NAME','non_empty_match_list',3,'p_non_empty_match_list','parse.py',491),
+  ('block_end -> RETURN SEMICOLON','block_end',2,'p_empty_return','parse.py',496),
+  ('block_end -> RETURN expression SEMICOLON','block_end',3,'p_return','parse.py',500),
+  ('block_end -> THROW expression SEMICOLON','block_end',3,'p_throw','parse.py',504),
+  ('block_end -> empty','block_end',1,'p_end','parse.py',508),
+  ('empty -> <empty>','empty',0,'p_empty','parse.py',512),
+]
@@ -52,6 +52,8 @@ uint = Primitive('uint', uint_methods)
 
 socket = Primitive('socket', {})
 file = Primitive('file', {})
+buffer = Primitive('buffer', {})
+epoll = Primitive('epoll', {})
 
 class NamedType(Type):
     def __init__(self, module, name):
@@ -184,6 +186,7 @@ class Enum(Type):
     def __init__(self, name, constructors):
         self.name = name
         self.constructors = constructors
+        self.tags = {}
 
 def template_signature((arguments, return_type), replacements):
     arguments = [arg.template(replacements) for arg in arguments]
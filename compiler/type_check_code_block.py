@@ -1,7 +1,7 @@
 import program
 import program_types
 from program_types import bool, uint, string, char, byte, bytestring, socket
-from program_types import void, file
+from program_types import void, file, buffer, epoll
 
 class Call(object):
     pass
@@ -98,27 +98,63 @@ sys_call_signatures = {
     'print_bool': ([bool], void),
     'print_char': ([char], void),
     'print_string': ([string], void),
+    'stdout_write': ([bytestring], void),
+    'stdout_write_string': ([string], void),
+    'stdout_buffer_size': ([uint], void),
+    'stdout_flush': ([], void),
 
     'socket_socket': ([uint, uint, uint], socket),
     'socket_bind': ([socket, string, uint], void),
     'socket_listen': ([socket, uint], void),
     'socket_accept': ([socket], socket),
     'socket_recv': ([socket, uint], bytestring),
+    'socket_recv_into': ([socket, buffer], uint),
     'socket_send': ([socket, bytestring], void),
+    'socket_send_list': ([socket, program_types.Instantiation(program_types.list, [bytestring])], void),
     'socket_close': ([socket], void),
+    'socket_set_nonblocking': ([socket], void),
+    'socket_accept_nonblocking': ([socket], program_types.Instantiation(program_types.tuple, [socket, bool])),
+    'socket_recv_some': ([socket, uint], program_types.Instantiation(program_types.tuple, [bytestring, bool])),
+    'socket_send_some': ([socket, bytestring], uint),
 
     'file_open': ([bytestring, uint], file),
     'file_read': ([file, uint], bytestring),
+    'file_read_into': ([file, buffer], uint),
     'file_write': ([file, bytestring], void),
+    'file_write_list': ([file, program_types.Instantiation(program_types.list, [bytestring])], void),
     'file_close': ([file], void),
     'file_exists': ([bytestring], bool),
 
+    'epoll': ([], epoll),
+    'epoll_create': ([uint], epoll),
+    'epoll_register': ([epoll, socket, uint], void),
+    'epoll_modify': ([epoll, socket, uint], void),
+    'epoll_unregister': ([epoll, socket], void),
+    'epoll_poll': ([epoll], uint),
+    'epoll_poll_timeout': ([epoll, uint], uint),
+    'epoll_ready': ([epoll, uint], socket),
+    'epoll_register_file': ([epoll, file, uint], void),
+    'epoll_modify_file': ([epoll, file, uint], void),
+    'epoll_unregister_file': ([epoll, file], void),
+    'epoll_ready_file': ([epoll, uint], file),
+    'epoll_flags': ([epoll, uint], uint),
+
+    'buffer_new': ([uint], buffer),
+    'buffer_length': ([buffer], uint),
+    'buffer_capacity': ([buffer], uint),
+    'buffer_slice': ([buffer, uint, uint], bytestring),
+    'buffer_consume': ([buffer, uint], void),
+
     'bytecode_file': ([], bytestring),
+
+    'spawn': ([program_types.coroutine_type(void, void)], void),
 }
 
 op_call_signatures = {
     "EPOLLIN" : ([], uint),
     "EPOLLOUT": ([], uint),
+    "EPOLLET": ([], uint),
+    "EPOLLONESHOT": ([], uint),
     "unpack_uint": ([bytestring], uint),
 }
 
@@ -3,7 +3,7 @@ import type_check_code_block
 import module_interface
 import program_types
 from program_types import bool, uint, string, char, byte, bytestring, socket
-from program_types import void, file
+from program_types import void, file, buffer, epoll
 
 bytestring_list = program_types.Instantiation(program_types.list, [program_types.bytestring])
 entry_point = program_types.Interface('EntryPoint', [], {'main': ([bytestring_list], bool)})
@@ -17,6 +17,8 @@ primitives = {
     'String': string,
     'Socket': socket,
     'File': file,
+    'Buffer': buffer,
+    'EPoll': epoll,
     'EntryPoint': entry_point,
     'List': program_types.list,
     'Coroutine': program_types.coroutine
@@ -145,6 +147,7 @@ def type_check_module(module_interfaces, module_name, module_decl):
             constructor.resolve_types(module_interfaces, types)
             assert not constructor.name in enum.type_constructor.constructors
             enum.type_constructor.constructors[constructor.name] = constructor.types
+            enum.type_constructor.tags[constructor.name] = len(enum.type_constructor.tags)
             signature = type_check_code_block.FunctionSignature(constructor.types, enum.type)
             module.signatures[constructor.name] = signature
 
@@ -22,8 +22,6 @@ def entry_point(argv):
     rsignal.pypysig_setflag(rsignal.SIGINT)
     rsocket.rsocket_startup()
 
-    constructor = bytecode.constructor.BytecodeConstructor()
-
     if len(argv) < 3:
         print_usage(argv[0])
         return 1
@@ -49,13 +47,14 @@ def entry_point(argv):
         return 1
 
     with open(program, 'r') as fd:
-        bytecode.read.read_bytecode(fd, constructor)
+        loaded_program = bytecode.read.load_program(fd, executor.RegistryLinker())
 
-    arguments = [operators.list.DList([data.ByteString(arg) for arg in argv])]
+    arguments = [operators.list.from_list([data.ByteString(arg) for arg in argv])]
 
     try:
-        ex = executor.execute(sys_caller, constructor.get_program(), arguments)
+        ex = executor.execute(sys_caller, loaded_program, arguments)
     finally:
+        sys_calls.stdout.output.flush()
         if trace_fd:
             trace_fd.close()
 
@@ -1,20 +1,27 @@
 from rpython.rlib.jit import purefunction
+from bytecode import format
 
 class Program(object):
-    def __init__(self, functions):
+    # A negative memory size means the size is unknown and memory grows as
+    # it's stored to.
+    def __init__(self, functions, memory_size=-1):
         self.functions = functions
+        self.memory_size = memory_size
 
     @purefunction
     def get_function(self, function):
         return self.functions[function]
 
 class Function(object):
-    _immutable_fields_ = ['name', 'num_arguments', 'num_return_values', 'blocks[*]']
-    def __init__(self, name, num_arguments, num_return_values, blocks):
+    _immutable_fields_ = ['name', 'num_arguments', 'num_return_values', 'blocks[*]', 'block_value_offsets[*]', 'n_values', 'frame_size']
+    def __init__(self, name, num_arguments, num_return_values, blocks, block_value_offsets, n_values):
         self.name = name
         self.num_arguments = num_arguments
         self.num_return_values = num_return_values
         self.blocks = list(blocks)
+        self.block_value_offsets = list(block_value_offsets)
+        self.n_values = n_values
+        self.frame_size = num_arguments + n_values
 
     @purefunction
     def num_blocks(self):
@@ -43,9 +50,10 @@ class BasicBlock(object):
         return self.instructions[i]
 
 class Instruction(object):
-    pass
+    opcode = 0
 
 class Phi(Instruction):
+    opcode = format.PHI
     def __init__(self, inputs):
         self.inputs = inputs
 
@@ -54,147 +62,208 @@ class Phi(Instruction):
         return self.inputs[i]
 
 class Copy(Instruction):
-    pass
+    opcode = format.COPY
 
 class Move(Instruction):
+    opcode = format.MOVE
     _immutable_fields_ = ['variable']
     def __init__(self, variable):
         self.variable = variable
 
 class Unpack(Instruction):
-    pass
+    opcode = format.UNPACK
 
 class Operation(Instruction):
-    _immutable_fields_ = ['operator', 'arguments[*]']
-    def __init__(self, operator, arguments):
+    opcode = format.OPERATION
+    _immutable_fields_ = ['operator', 'handler', 'arguments[*]']
+    def __init__(self, operator, arguments, handler=None):
         self.operator = operator
         self.arguments = list(arguments)
+        self.handler = handler
 
 class FunctionCall(Instruction):
+    opcode = format.FUN_CALL
     _immutable_fields_ = ['function', 'arguments[*]']
     def __init__(self, function, arguments):
         self.function = function
         self.arguments = list(arguments)
 
 class SysCall(Instruction):
-    _immutable_fields_ = ['function', 'arguments[*]']
-    def __init__(self, function, arguments):
+    opcode = format.SYS_CALL
+    _immutable_fields_ = ['function', 'handler', 'arguments[*]']
+    def __init__(self, function, arguments, handler=None):
         self.function = function
         self.arguments = list(arguments)
+        self.handler = handler
 
 class NewCoroutine(Instruction):
+    opcode = format.NEW_COROUTINE
     _immutable_fields_ = ['function', 'arguments[*]']
     def __init__(self, function, arguments):
         self.function = function
         self.arguments = list(arguments)
 
 class Debug(Instruction):
+    opcode = format.DEBUG
     _immutable_fields_ = ['value']
     def __init__(self, value):
         self.value = value
 
 class ConstantBool(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_BOOL
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantByte(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_BYTE
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantChar(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_CHAR
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantByteString(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_BYTESTRING
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantString(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_STRING
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantInt(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_INT
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantUInt(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_UINT
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class ConstantDouble(Instruction):
-    _immutable_fields_ = ['value']
-    def __init__(self, value):
+    opcode = format.CONST_DOUBLE
+    _immutable_fields_ = ['value', 'constant']
+    def __init__(self, value, constant=None):
         self.value = value
+        self.constant = constant
 
 class Void(Instruction):
-    pass
+    opcode = format.VOID
 
 class Load(Instruction):
+    opcode = format.LOAD
     _immutable_fields_ = ['address']
     def __init__(self, address):
         self.address = address
 
 class Store(Instruction):
+    opcode = format.STORE
     _immutable_fields_ = ['address', 'variable']
     def __init__(self, address, variable):
         self.address = address
         self.variable = variable
 
 class Get(Instruction):
-    pass
+    opcode = format.GET
 
 class Put(Instruction):
+    opcode = format.PUT
     _immutable_fields_ = ['variable']
     def __init__(self, variable):
         self.variable = variable
 
 class RunCoroutine(Instruction):
+    opcode = format.RUN_COROUTINE
     _immutable_fields_ = ['coroutine']
     def __init__(self, coroutine):
         self.coroutine = coroutine
 
 class Yield(Instruction):
+    opcode = format.YIELD
     _immutable_fields_ = ['value']
     def __init__(self, value):
         self.value = value
 
 class Resume(Instruction):
+    opcode = format.RESUME
     _immutable_fields_ = ['coroutine', 'value']
     def __init__(self, coroutine, value):
         self.coroutine = coroutine
         self.value = value
 
+class Tuple(Instruction):
+    opcode = format.TUPLE
+    _immutable_fields_ = ['arguments[*]']
+    def __init__(self, arguments):
+        self.arguments = list(arguments)
+
+class Field(Instruction):
+    opcode = format.FIELD
+    _immutable_fields_ = ['variable', 'index']
+    def __init__(self, variable, index):
+        self.variable = variable
+        self.index = index
+
 class Terminator(object):
-    pass
+    opcode = 0
 
 class Return(Terminator):
+    opcode = format.RET
     _immutable_fields_ = ['variables[*]']
     def __init__(self, variables):
         self.variables = list(variables)
 
 class Goto(Terminator):
+    opcode = format.GOTO
     _immutable_fields_ = ['block_index']
     def __init__(self, block_index):
         self.block_index = block_index
 
 class Conditional(Terminator):
+    opcode = format.CONDITIONAL
     _immutable_fields_ = ['condition_variable', 'true_block', 'false_block']
     def __init__(self, condition_variable, true_block, false_block):
         self.condition_variable = condition_variable
         self.true_block = true_block
         self.false_block = false_block
 
+class Switch(Terminator):
+    opcode = format.SWITCH
+    _immutable_fields_ = ['variable', 'blocks[*]', 'default_block']
+    def __init__(self, variable, blocks, default_block):
+        self.variable = variable
+        self.blocks = list(blocks)
+        self.default_block = default_block
+
+    @purefunction
+    def target(self, n):
+        if n < len(self.blocks):
+            return self.blocks[n]
+        return self.default_block
+
 class CatchFireAndDie(Terminator):
-    pass
+    opcode = format.CATCH_FIRE_AND_DIE
 
 class Throw(Terminator):
+    opcode = format.THROW
     _immutable_fields_ = ['exception']
     def __init__(self, exception):
         self.exception = exception
@@ -1,6 +1,40 @@
 import bytecode
 import struct
 
+class Linker(object):
+    # Resolves operator and sys call names to their handlers and builds the
+    # values of constant instructions. The base class leaves instructions
+    # unlinked, which is what the compiler wants.
+    def operator(self, name):
+        return None
+
+    def sys_call(self, name):
+        return None
+
+    def constant_bool(self, value):
+        return None
+
+    def constant_int(self, value):
+        return None
+
+    def constant_uint(self, value):
+        return None
+
+    def constant_double(self, value):
+        return None
+
+    def constant_byte(self, value):
+        return None
+
+    def constant_char(self, value):
+        return None
+
+    def constant_string(self, value):
+        return None
+
+    def constant_bytestring(self, value):
+        return None
+
 class BasicBlockConstructor(object):
     def __init__(self, function, index):
         self.function = function
@@ -47,35 +81,43 @@ class BasicBlockConstructor(object):
         return self.function.create_variable()
 
     def constant_bool(self, value):
-        self.instructions.append(bytecode.ConstantBool(value))
+        constant = self.function.linker.constant_bool(value)
+        self.instructions.append(bytecode.ConstantBool(value, constant))
         return self.function.create_variable()
 
     def constant_int(self, value):
-        self.instructions.append(bytecode.ConstantInt(value))
+        constant = self.function.linker.constant_int(value)
+        self.instructions.append(bytecode.ConstantInt(value, constant))
         return self.function.create_variable()
 
     def constant_uint(self, value):
-        self.instructions.append(bytecode.ConstantUInt(value))
+        constant = self.function.linker.constant_uint(value)
+        self.instructions.append(bytecode.ConstantUInt(value, constant))
         return self.function.create_variable()
 
     def constant_double(self, value):
-        self.instructions.append(bytecode.ConstantDouble(value))
+        constant = self.function.linker.constant_double(value)
+        self.instructions.append(bytecode.ConstantDouble(value, constant))
         return self.function.create_variable()
 
     def constant_byte(self, value):
-        self.instructions.append(bytecode.ConstantByte(value))
+        constant = self.function.linker.constant_byte(value)
+        self.instructions.append(bytecode.ConstantByte(value, constant))
         return self.function.create_variable()
 
     def constant_char(self, value):
-        self.instructions.append(bytecode.ConstantChar(value))
+        constant = self.function.linker.constant_char(value)
+        self.instructions.append(bytecode.ConstantChar(value, constant))
         return self.function.create_variable()
 
     def constant_string(self, value):
-        self.instructions.append(bytecode.ConstantString(value))
+        constant = self.function.linker.constant_string(value)
+        self.instructions.append(bytecode.ConstantString(value, constant))
         return self.function.create_variable()
 
     def constant_bytestring(self, value):
-        self.instructions.append(bytecode.ConstantByteString(value))
+        constant = self.function.linker.constant_bytestring(value)
+        self.instructions.append(bytecode.ConstantByteString(value, constant))
         return self.function.create_variable()
 
     def void(self):
@@ -83,7 +125,8 @@ class BasicBlockConstructor(object):
         return self.function.create_variable()
 
     def operation(self, operator, arguments):
-        self.instructions.append(bytecode.Operation(operator, arguments))
+        handler = self.function.linker.operator(operator)
+        self.instructions.append(bytecode.Operation(operator, arguments, handler))
         return self.function.create_variable()
 
     def fun_call(self, function, arguments):
@@ -95,7 +138,8 @@ class BasicBlockConstructor(object):
         return self.function.create_variable()
 
     def sys_call(self, function, arguments):
-        self.instructions.append(bytecode.SysCall(function, arguments))
+        handler = self.function.linker.sys_call(function)
+        self.instructions.append(bytecode.SysCall(function, arguments, handler))
         return self.function.create_variable()
 
     def new_coroutine(self, function, arguments):
@@ -130,6 +174,14 @@ class BasicBlockConstructor(object):
         self.instructions.append(bytecode.Resume(coroutine, value))
         return self.function.create_variable()
 
+    def tuple(self, arguments):
+        self.instructions.append(bytecode.Tuple(arguments))
+        return self.function.create_variable()
+
+    def field(self, variable, index):
+        self.instructions.append(bytecode.Field(variable, index))
+        return self.function.create_variable()
+
     def ret_multiple(self, variables):
         assert len(variables) == self.function.num_return_values
         self.terminal = bytecode.Return(variables)
@@ -153,6 +205,14 @@ class BasicBlockConstructor(object):
     def conditional(self, variable, true_block, false_block):
         self.special_conditional(variable, true_block, false_block)
 
+    # Only available for constructor
+    def special_switch(self, variable, blocks, default_block):
+        self.terminal = bytecode.Switch(variable, blocks, default_block)
+        return self.terminal
+
+    def switch(self, variable, blocks, default_block):
+        self.special_switch(variable, blocks, default_block)
+
     def catch_fire_and_die(self):
         self.terminal = bytecode.CatchFireAndDie()
 
@@ -163,8 +223,9 @@ class BasicBlockConstructor(object):
         return bytecode.BasicBlock(self.instructions, self.terminal)
 
 class FunctionConstructor(object):
-    def __init__(self, name, num_arguments, num_return_values):
+    def __init__(self, name, num_arguments, num_return_values, linker):
         self.name = name
+        self.linker = linker
         self.basic_blocks = []
         self.num_arguments = num_arguments
         self.next_variable = num_arguments
@@ -190,14 +251,26 @@ class FunctionConstructor(object):
 
     def get_function(self):
         basic_blocks = [basic_block.get_basic_block() for basic_block in self.basic_blocks]
-        return bytecode.Function(self.name, self.num_arguments, self.num_return_values, basic_blocks)
+
+        block_value_offsets = []
+        n_values = 0
+        for basic_block in basic_blocks:
+            block_value_offsets.append(self.num_arguments + n_values)
+            n_values += basic_block.num_instructions()
+
+        return bytecode.Function(self.name, self.num_arguments, self.num_return_values, basic_blocks, block_value_offsets, n_values)
 
 class ProgramConstructor(object):
-    def __init__(self):
+    def __init__(self, linker):
         self.functions = []
+        self.linker = linker
+        self.memory_size_n = -1
+
+    def memory_size(self, n):
+        self.memory_size_n = n
 
     def function(self, name, num_arguments, num_return_values=1):
-        function = FunctionConstructor(name, num_arguments, num_return_values)
+        function = FunctionConstructor(name, num_arguments, num_return_values, self.linker)
         self.functions.append(function)
         return function
 
@@ -206,11 +279,13 @@ class ProgramConstructor(object):
         function_map = {}
         for function in functions:
             function_map[function.name] = function
-        return bytecode.Program(function_map)
+        return bytecode.Program(function_map, self.memory_size_n)
 
 class BytecodeConstructor(object):
-    def __init__(self):
-        self.program = ProgramConstructor()
+    def __init__(self, linker=None):
+        if linker is None:
+            linker = Linker()
+        self.program = ProgramConstructor(linker)
 
     def __enter__(self):
         return self.program
@@ -1,11 +1,17 @@
 from rpython.rlib.rstruct.runpack import runpack
 from rpython.rlib.rarithmetic import r_ulonglong, r_int, intmask
 
-MAGIC_START = r_ulonglong(17810926409145293181)
+# Version 1 files encode every integer as a fixed width '>Q'. Later files use
+# MAGIC_START followed by a varint format version and varint integers.
+MAGIC_START_V1 = r_ulonglong(17810926409145293181)
+MAGIC_START = r_ulonglong(4712128852136459333)
+FORMAT_VERSION = 6
 
 # Top level
 SYMBOL = 1
 FUNCTION_START = 2
+FUNCTION_INDEX = 3
+MEMORY_SIZE = 4
 
 # Instructions
 PHI = 1
@@ -29,6 +35,9 @@ FUN_CALL = 34
 NEW_COROUTINE = 35
 DEBUG = 36
 
+TUPLE = 48
+FIELD = 49
+
 LOAD = 64
 STORE = 65
 GET = 66
@@ -43,3 +52,4 @@ GOTO = 130
 CONDITIONAL = 131
 CATCH_FIRE_AND_DIE = 132
 THROW = 133
+SWITCH = 134
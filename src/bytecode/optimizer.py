@@ -0,0 +1,590 @@
+import bytecode
+import bytecode.constructor
+import bytecode.serialize
+import copy
+
+MAX_INT = 2 ** 63
+
+# Functions with at most this many instructions are inlined into their callers
+INLINE_THRESHOLD = 8
+
+def uint_result(n):
+    if 0 <= n < MAX_INT:
+        return n
+
+def int_result(n):
+    if -MAX_INT <= n < MAX_INT:
+        return n
+
+def uint_div(a, b):
+    if b != 0:
+        return a / b
+
+# Operators that can be evaluated at compile time: the kinds of constant they
+# take, the kind of constant they produce and a function that computes the
+# result, or returns None when it can't be folded.
+foldable_operators = {
+    'uint.add': (['uint', 'uint'], 'uint', lambda a, b: uint_result(a + b)),
+    'uint.sub': (['uint', 'uint'], 'uint', lambda a, b: uint_result(a - b)),
+    'uint.mul': (['uint', 'uint'], 'uint', lambda a, b: uint_result(a * b)),
+    'uint.div': (['uint', 'uint'], 'uint', uint_div),
+    'uint.gt': (['uint', 'uint'], 'bool', lambda a, b: a > b),
+    'uint.lt': (['uint', 'uint'], 'bool', lambda a, b: a < b),
+    'uint.ge': (['uint', 'uint'], 'bool', lambda a, b: a >= b),
+    'uint.le': (['uint', 'uint'], 'bool', lambda a, b: a <= b),
+    'uint.eq': (['uint', 'uint'], 'bool', lambda a, b: a == b),
+    'uint.ne': (['uint', 'uint'], 'bool', lambda a, b: a != b),
+    'int.add': (['int', 'int'], 'int', lambda a, b: int_result(a + b)),
+    'int.sub': (['int', 'int'], 'int', lambda a, b: int_result(a - b)),
+    'int.mul': (['int', 'int'], 'int', lambda a, b: int_result(a * b)),
+    'int.gt': (['int', 'int'], 'bool', lambda a, b: a > b),
+    'int.lt': (['int', 'int'], 'bool', lambda a, b: a < b),
+    'int.ge': (['int', 'int'], 'bool', lambda a, b: a >= b),
+    'int.le': (['int', 'int'], 'bool', lambda a, b: a <= b),
+    'int.eq': (['int', 'int'], 'bool', lambda a, b: a == b),
+    'int.ne': (['int', 'int'], 'bool', lambda a, b: a != b),
+    'and': (['bool', 'bool'], 'bool', lambda a, b: a and b),
+    'or': (['bool', 'bool'], 'bool', lambda a, b: a or b),
+    'not': (['bool'], 'bool', lambda a: not a),
+    'char.eq': (['char', 'char'], 'bool', lambda a, b: a == b),
+    'byte.eq': (['byte', 'byte'], 'bool', lambda a, b: a == b),
+    'bytestring.eq': (['bytestring', 'bytestring'], 'bool', lambda a, b: a == b),
+    'string.eq': (['string', 'string'], 'bool', lambda a, b: a == b),
+    'string.ne': (['string', 'string'], 'bool', lambda a, b: a != b),
+}
+
+constant_kinds = {
+    bytecode.ConstantBool: 'bool',
+    bytecode.ConstantInt: 'int',
+    bytecode.ConstantUInt: 'uint',
+    bytecode.ConstantByte: 'byte',
+    bytecode.ConstantChar: 'char',
+    bytecode.ConstantString: 'string',
+    bytecode.ConstantByteString: 'bytestring',
+}
+
+constant_instructions = dict((kind, cls) for cls, kind in constant_kinds.iteritems())
+
+# Instructions that have no effect other than producing their value. Operators
+# are side effect free, so an operation is only kept for its result.
+pure_instructions = (
+    bytecode.Phi,
+    bytecode.Copy,
+    bytecode.Move,
+    bytecode.Operation,
+    bytecode.Void,
+    bytecode.ConstantBool,
+    bytecode.ConstantInt,
+    bytecode.ConstantUInt,
+    bytecode.ConstantDouble,
+    bytecode.ConstantByte,
+    bytecode.ConstantChar,
+    bytecode.ConstantString,
+    bytecode.ConstantByteString,
+    bytecode.Tuple,
+    bytecode.Field,
+)
+
+def uses(instruction):
+    if isinstance(instruction, bytecode.Phi):
+        return instruction.inputs.values()
+    elif isinstance(instruction, (bytecode.Move, bytecode.Put, bytecode.Field)):
+        return [instruction.variable]
+    elif isinstance(instruction, (bytecode.Operation, bytecode.FunctionCall, bytecode.SysCall, bytecode.NewCoroutine, bytecode.Tuple)):
+        return instruction.arguments
+    elif isinstance(instruction, (bytecode.Debug, bytecode.Yield)):
+        return [instruction.value]
+    elif isinstance(instruction, bytecode.Load):
+        return [instruction.address]
+    elif isinstance(instruction, bytecode.Store):
+        return [instruction.address, instruction.variable]
+    elif isinstance(instruction, bytecode.RunCoroutine):
+        return [instruction.coroutine]
+    elif isinstance(instruction, bytecode.Resume):
+        return [instruction.coroutine, instruction.value]
+    elif isinstance(instruction, bytecode.Return):
+        return instruction.variables
+    elif isinstance(instruction, bytecode.Conditional):
+        return [instruction.condition_variable]
+    elif isinstance(instruction, bytecode.Switch):
+        return [instruction.variable]
+    elif isinstance(instruction, bytecode.Throw):
+        return [instruction.exception]
+    return []
+
+def rename(instruction, f):
+    if isinstance(instruction, bytecode.Phi):
+        instruction.inputs = dict((block, f(var)) for block, var in instruction.inputs.iteritems())
+    elif isinstance(instruction, (bytecode.Move, bytecode.Put, bytecode.Field)):
+        instruction.variable = f(instruction.variable)
+    elif isinstance(instruction, (bytecode.Operation, bytecode.FunctionCall, bytecode.SysCall, bytecode.NewCoroutine, bytecode.Tuple)):
+        instruction.arguments = [f(var) for var in instruction.arguments]
+    elif isinstance(instruction, (bytecode.Debug, bytecode.Yield)):
+        instruction.value = f(instruction.value)
+    elif isinstance(instruction, bytecode.Load):
+        instruction.address = f(instruction.address)
+    elif isinstance(instruction, bytecode.Store):
+        instruction.address = f(instruction.address)
+        instruction.variable = f(instruction.variable)
+    elif isinstance(instruction, bytecode.RunCoroutine):
+        instruction.coroutine = f(instruction.coroutine)
+    elif isinstance(instruction, bytecode.Resume):
+        instruction.coroutine = f(instruction.coroutine)
+        instruction.value = f(instruction.value)
+    elif isinstance(instruction, bytecode.Return):
+        instruction.variables = [f(var) for var in instruction.variables]
+    elif isinstance(instruction, bytecode.Conditional):
+        instruction.condition_variable = f(instruction.condition_variable)
+    elif isinstance(instruction, bytecode.Switch):
+        instruction.variable = f(instruction.variable)
+    elif isinstance(instruction, bytecode.Throw):
+        instruction.exception = f(instruction.exception)
+
+def successors(terminator):
+    if isinstance(terminator, bytecode.Goto):
+        return [terminator.block_index]
+    elif isinstance(terminator, bytecode.Conditional):
+        return [terminator.true_block, terminator.false_block]
+    elif isinstance(terminator, bytecode.Switch):
+        return terminator.blocks + [terminator.default_block]
+    return []
+
+def retarget(terminator, f):
+    if isinstance(terminator, bytecode.Goto):
+        terminator.block_index = f(terminator.block_index)
+    elif isinstance(terminator, bytecode.Conditional):
+        terminator.true_block = f(terminator.true_block)
+        terminator.false_block = f(terminator.false_block)
+    elif isinstance(terminator, bytecode.Switch):
+        terminator.blocks = [f(block) for block in terminator.blocks]
+        terminator.default_block = f(terminator.default_block)
+
+class Block(object):
+    def __init__(self, instructions, terminator):
+        # A list of (variable, instruction) pairs
+        self.instructions = instructions
+        self.terminator = terminator
+
+    def followed_by(self, i, cls):
+        return i + 1 < len(self.instructions) and isinstance(self.instructions[i + 1][1], cls)
+
+# Values are consumed when they are read and COPY duplicates the value of the
+# instruction before it, so instructions are never reordered. An instruction
+# that is followed by a COPY is kept in place, as is one followed by UNPACK.
+class FunctionOptimizer(object):
+    def __init__(self, function):
+        self.name = function.name
+        self.num_arguments = function.num_arguments
+        self.num_return_values = function.num_return_values
+        self.blocks = []
+        for i, block in enumerate(function.blocks):
+            offset = function.get_block_value_offset(i)
+            instructions = [[offset + j, instruction] for j, instruction in enumerate(block.instructions)]
+            self.blocks.append(Block(instructions, block.terminator))
+        self.next_variable = function.num_arguments + function.n_values
+
+    def size(self):
+        return sum([len(block.instructions) for block in self.blocks])
+
+    def predecessors(self):
+        predecessors = {}
+        for i, block in enumerate(self.blocks):
+            for successor in successors(block.terminator):
+                predecessors.setdefault(successor, set()).add(i)
+        return predecessors
+
+    def rekey_phis(self, old, new, targets):
+        # Phis in targets that read from block old now read from block new
+        for target in set(targets):
+            for variable, instruction in self.blocks[target].instructions:
+                if isinstance(instruction, bytecode.Phi) and old in instruction.inputs:
+                    inputs = dict(instruction.inputs)
+                    inputs[new] = inputs.pop(old)
+                    instruction.inputs = inputs
+
+    def definitions(self):
+        # Maps each variable to its block, its instruction and the variable
+        # defined just before it, which is what a COPY duplicates.
+        definitions = {}
+        for i, block in enumerate(self.blocks):
+            previous = None
+            for variable, instruction in block.instructions:
+                definitions[variable] = (i, instruction, previous)
+                previous = variable
+        return definitions
+
+    def use_counts(self):
+        counts = {}
+        for block in self.blocks:
+            for variable, instruction in block.instructions:
+                for var in uses(instruction):
+                    counts[var] = counts.get(var, 0) + 1
+            for var in uses(block.terminator):
+                counts[var] = counts.get(var, 0) + 1
+        return counts
+
+    def phi_users(self):
+        users = {}
+        for i, block in enumerate(self.blocks):
+            for variable, instruction in block.instructions:
+                if isinstance(instruction, bytecode.Phi):
+                    for var in instruction.inputs.values():
+                        users.setdefault(var, set()).add(i)
+        return users
+
+    def replace(self, mapping):
+        def f(var):
+            while var in mapping:
+                var = mapping[var]
+            return var
+
+        for block in self.blocks:
+            for variable, instruction in block.instructions:
+                rename(instruction, f)
+            rename(block.terminator, f)
+
+    def substitute(self, mapping, variable, replacement, definitions, phi_users):
+        # Phis in a block read their inputs one after another, so an input
+        # must not be redirected to another phi of the same block, which may
+        # already have been overwritten.
+        while replacement in mapping:
+            replacement = mapping[replacement]
+        if replacement == variable:
+            return False
+        if replacement in definitions:
+            block_index, instruction, previous = definitions[replacement]
+            if isinstance(instruction, bytecode.Phi) and block_index in phi_users.get(variable, ()):
+                return False
+        mapping[variable] = replacement
+        phi_users.setdefault(replacement, set()).update(phi_users.get(variable, ()))
+        return True
+
+    def constant(self, variable, definitions):
+        if not variable in definitions:
+            return None
+        block_index, instruction, previous = definitions[variable]
+        if isinstance(instruction, bytecode.Copy):
+            return self.constant(previous, definitions)
+        kind = constant_kinds.get(type(instruction))
+        if kind:
+            return (kind, instruction.value)
+        return None
+
+    def fold_constants(self):
+        changed = False
+        definitions = self.definitions()
+        for block in self.blocks:
+            for pair in block.instructions:
+                instruction = pair[1]
+                if isinstance(instruction, bytecode.Operation) and instruction.operator in foldable_operators:
+                    kinds, result_kind, fn = foldable_operators[instruction.operator]
+                    arguments = [self.constant(var, definitions) for var in instruction.arguments]
+                    if [argument and argument[0] for argument in arguments] == kinds:
+                        result = fn(*[value for kind, value in arguments])
+                        if result is not None:
+                            pair[1] = constant_instructions[result_kind](result)
+                            changed = True
+
+            terminator = block.terminator
+            if isinstance(terminator, bytecode.Conditional):
+                condition = self.constant(terminator.condition_variable, definitions)
+                if condition and condition[0] == 'bool':
+                    if condition[1]:
+                        block.terminator = bytecode.Goto(terminator.true_block)
+                    else:
+                        block.terminator = bytecode.Goto(terminator.false_block)
+                    changed = True
+            elif isinstance(terminator, bytecode.Switch):
+                value = self.constant(terminator.variable, definitions)
+                if value and value[0] == 'uint':
+                    block.terminator = bytecode.Goto(terminator.target(value[1]))
+                    changed = True
+        return changed
+
+    def forward_copies(self):
+        # A copy of a value that is otherwise unused can be replaced by the
+        # value itself.
+        mapping = {}
+        counts = self.use_counts()
+        definitions = self.definitions()
+        phi_users = self.phi_users()
+        for block in self.blocks:
+            instructions = []
+            for variable, instruction in block.instructions:
+                if isinstance(instruction, bytecode.Copy) and instructions:
+                    source = instructions[-1][0]
+                    if counts.get(source, 0) == 0 and self.substitute(mapping, variable, source, definitions, phi_users):
+                        counts[source] = counts.get(variable, 0)
+                        continue
+                instructions.append([variable, instruction])
+            block.instructions = instructions
+        self.replace(mapping)
+        return bool(mapping)
+
+    def propagate_moves(self):
+        mapping = {}
+        definitions = self.definitions()
+        phi_users = self.phi_users()
+        for block in self.blocks:
+            instructions = []
+            for i, (variable, instruction) in enumerate(block.instructions):
+                if isinstance(instruction, bytecode.Move) and not block.followed_by(i, bytecode.Copy):
+                    if self.substitute(mapping, variable, instruction.variable, definitions, phi_users):
+                        continue
+                instructions.append([variable, instruction])
+            block.instructions = instructions
+        self.replace(mapping)
+        return bool(mapping)
+
+    def remove_trivial_phis(self):
+        mapping = {}
+        definitions = self.definitions()
+        phi_users = self.phi_users()
+        for block in self.blocks:
+            instructions = []
+            for i, (variable, instruction) in enumerate(block.instructions):
+                if isinstance(instruction, bytecode.Phi) and not block.followed_by(i, bytecode.Copy):
+                    inputs = set(instruction.inputs.values()) - set([variable])
+                    if len(inputs) == 1:
+                        if self.substitute(mapping, variable, inputs.pop(), definitions, phi_users):
+                            continue
+                instructions.append([variable, instruction])
+            block.instructions = instructions
+        self.replace(mapping)
+        return bool(mapping)
+
+    def prune_unreachable_blocks(self):
+        reachable = set()
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            if not i in reachable:
+                reachable.add(i)
+                stack.extend(successors(self.blocks[i].terminator))
+
+        predecessors = {}
+        for i in reachable:
+            for successor in successors(self.blocks[i].terminator):
+                predecessors.setdefault(successor, set()).add(i)
+
+        changed = len(reachable) != len(self.blocks)
+        for i in reachable:
+            for variable, instruction in self.blocks[i].instructions:
+                if isinstance(instruction, bytecode.Phi):
+                    inputs = dict((block, var) for block, var in instruction.inputs.iteritems() if block in predecessors.get(i, ()))
+                    if len(inputs) != len(instruction.inputs):
+                        instruction.inputs = inputs
+                        changed = True
+
+        if len(reachable) != len(self.blocks):
+            new_index = {}
+            blocks = []
+            for i, block in enumerate(self.blocks):
+                if i in reachable:
+                    new_index[i] = len(blocks)
+                    blocks.append(block)
+            self.blocks = blocks
+            for block in self.blocks:
+                retarget(block.terminator, new_index.get)
+                for variable, instruction in block.instructions:
+                    if isinstance(instruction, bytecode.Phi):
+                        instruction.inputs = dict((new_index[b], var) for b, var in instruction.inputs.iteritems())
+        return changed
+
+    def merge_blocks(self):
+        # Appends a block to its only predecessor when that ends in a goto
+        changed = False
+        predecessors = self.predecessors()
+        for i, block in enumerate(self.blocks):
+            while isinstance(block.terminator, bytecode.Goto):
+                j = block.terminator.block_index
+                target = self.blocks[j]
+                if j == 0 or j == i or predecessors.get(j) != set([i]):
+                    break
+                if [instruction for variable, instruction in target.instructions[:1] if isinstance(instruction, bytecode.Copy)]:
+                    break
+                if [instruction for variable, instruction in target.instructions if isinstance(instruction, bytecode.Phi)]:
+                    break
+                block.instructions = block.instructions + target.instructions
+                block.terminator = target.terminator
+                self.rekey_phis(j, i, successors(target.terminator))
+                for successor in successors(target.terminator):
+                    predecessors[successor].discard(j)
+                    predecessors[successor].add(i)
+                predecessors[j] = set()
+                self.blocks[j] = Block([], bytecode.CatchFireAndDie())
+                changed = True
+        return changed
+
+    def inlinable(self, threshold):
+        if self.num_return_values != 1 or self.size() > threshold:
+            return False
+        if self.predecessors().get(0):
+            return False
+        for block in self.blocks:
+            if [instruction for variable, instruction in block.instructions[:1] if isinstance(instruction, bytecode.Copy)]:
+                return False
+        return True
+
+    def snapshot(self):
+        # Inlining rewrites blocks and instructions in place, so callees are
+        # inlined from a copy taken before any of that starts
+        snapshot = copy.copy(self)
+        snapshot.blocks = []
+        for block in self.blocks:
+            instructions = [[variable, copy.copy(instruction)] for variable, instruction in block.instructions]
+            snapshot.blocks.append(Block(instructions, copy.copy(block.terminator)))
+        return snapshot
+
+    def inline_calls(self, candidates):
+        inlined = 0
+        pending = range(len(self.blocks))
+        while pending:
+            i = pending.pop(0)
+            for j, (variable, instruction) in enumerate(self.blocks[i].instructions):
+                if isinstance(instruction, bytecode.FunctionCall) and instruction.function != self.name and instruction.function in candidates:
+                    pending.append(self.inline_call(i, j, candidates[instruction.function]))
+                    inlined += 1
+                    break
+        return inlined
+
+    def inline_call(self, i, j, callee):
+        # The callee's first block is appended to block i, its other blocks
+        # follow the existing ones and the instructions after the call move to
+        # a continuation block that receives the result.
+        block = self.blocks[i]
+        variable, call = block.instructions[j]
+        base = len(self.blocks)
+        continuation_index = base + len(callee.blocks) - 1
+        continuation = Block(block.instructions[j + 1:], block.terminator)
+        self.rekey_phis(i, continuation_index, successors(block.terminator))
+
+        mapping = dict(zip(range(callee.num_arguments), call.arguments))
+        def fresh(var):
+            if not var in mapping:
+                mapping[var] = self.next_variable
+                self.next_variable += 1
+            return mapping[var]
+
+        def block_index(k):
+            if k == 0:
+                return i
+            return base + k - 1
+
+        returns = {}
+        blocks = []
+        for k, callee_block in enumerate(callee.blocks):
+            instructions = []
+            for var, instruction in callee_block.instructions:
+                instruction = copy.copy(instruction)
+                rename(instruction, fresh)
+                if isinstance(instruction, bytecode.Phi):
+                    instruction.inputs = dict((block_index(b), v) for b, v in instruction.inputs.iteritems())
+                instructions.append([fresh(var), instruction])
+
+            terminator = copy.copy(callee_block.terminator)
+            rename(terminator, fresh)
+            if isinstance(terminator, bytecode.Return):
+                returns[block_index(k)] = terminator.variables[0]
+                terminator = bytecode.Goto(continuation_index)
+            else:
+                retarget(terminator, block_index)
+            blocks.append(Block(instructions, terminator))
+
+        block.instructions = block.instructions[:j] + blocks[0].instructions
+        block.terminator = blocks[0].terminator
+        self.blocks.extend(blocks[1:])
+
+        if len(returns) == 1:
+            result = bytecode.Move(returns.values()[0])
+        else:
+            result = bytecode.Phi(returns)
+        continuation.instructions.insert(0, [variable, result])
+        self.blocks.append(continuation)
+        return continuation_index
+
+    def remove_dead_instructions(self):
+        changed = False
+        counts = self.use_counts()
+        for block in self.blocks:
+            # Walk backwards so that the operands of removed instructions can
+            # be removed in the same pass.
+            instructions = []
+            for i in reversed(xrange(len(block.instructions))):
+                variable, instruction = block.instructions[i]
+                next_is_copy = instructions and isinstance(instructions[-1][1], bytecode.Copy)
+                removable = isinstance(instruction, pure_instructions) and not next_is_copy and not block.followed_by(i, bytecode.Unpack)
+                instruction_uses = uses(instruction)
+                if removable and counts.get(variable, 0) == instruction_uses.count(variable):
+                    for var in instruction_uses:
+                        counts[var] -= 1
+                    changed = True
+                    continue
+                instructions.append([variable, instruction])
+            instructions.reverse()
+            block.instructions = instructions
+        return changed
+
+    def optimize(self):
+        changed = True
+        while changed:
+            changed = False
+            changed |= self.fold_constants()
+            changed |= self.prune_unreachable_blocks()
+            changed |= self.merge_blocks()
+            changed |= self.forward_copies()
+            changed |= self.propagate_moves()
+            changed |= self.remove_trivial_phis()
+            changed |= self.remove_dead_instructions()
+
+    def write(self, program_writer):
+        numbering = dict((i, i) for i in xrange(self.num_arguments))
+        for block in self.blocks:
+            for variable, instruction in block.instructions:
+                numbering[variable] = len(numbering)
+        self.replace_all(numbering)
+
+        with program_writer.function(self.name, self.num_arguments, self.num_return_values) as (function_writer, _):
+            for block in self.blocks:
+                with function_writer.basic_block() as block_writer:
+                    instructions = [instruction for variable, instruction in block.instructions]
+                    bytecode.serialize.serialize_block(block_writer, bytecode.BasicBlock(instructions, block.terminator))
+
+    def replace_all(self, numbering):
+        for block in self.blocks:
+            for variable, instruction in block.instructions:
+                rename(instruction, numbering.__getitem__)
+            rename(block.terminator, numbering.__getitem__)
+
+def count_instructions(program):
+    n = 0
+    for function in program.functions.itervalues():
+        for block in function.blocks:
+            n += block.num_instructions()
+    return n
+
+def optimize(program, inline_threshold=INLINE_THRESHOLD):
+    # Returns the optimized program and the number of call sites inlined
+    optimizers = {}
+    for name, function in program.functions.iteritems():
+        optimizer = FunctionOptimizer(function)
+        optimizer.optimize()
+        optimizers[name] = optimizer
+
+    candidates = {}
+    for name, optimizer in optimizers.iteritems():
+        if optimizer.inlinable(inline_threshold):
+            candidates[name] = optimizer.snapshot()
+
+    inlined = 0
+    for name in sorted(optimizers):
+        inlined += optimizers[name].inline_calls(candidates)
+
+    constructor = bytecode.constructor.BytecodeConstructor()
+    with constructor as program_writer:
+        program_writer.memory_size(program.memory_size)
+        for name in sorted(optimizers):
+            optimizer = optimizers[name]
+            optimizer.optimize()
+            optimizer.write(program_writer)
+    return (constructor.get_program(), inlined)
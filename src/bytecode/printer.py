@@ -94,6 +94,12 @@ class BasicBlockPrinter(object):
     def resume(self, coroutine, value):
         return self.instruction("RESUME", coroutine, value)
 
+    def tuple(self, arguments):
+        return self.instruction("TUPLE", arguments)
+
+    def field(self, variable, index):
+        return self.instruction("FIELD", variable, index)
+
     def ret_multiple(self, variables):
         self.terminator("RET", variables)
 
@@ -106,6 +112,9 @@ class BasicBlockPrinter(object):
     def conditional(self, variable, true_block, false_block):
         self.terminator("CONDITIONAL", variable, true_block, false_block)
 
+    def switch(self, variable, blocks, default_block):
+        self.terminator("SWITCH", variable, blocks, default_block)
+
     def catch_fire_and_die(self):
         self.terminator("CATCH_FIRE_AND_DIE")
 
@@ -139,6 +148,9 @@ class FunctionPrinter(object):
         return BasicBlockPrinter(self, i)
 
 class ProgramPrinter(object):
+    def memory_size(self, n):
+        print ("MEMORY SIZE", n)
+
     def function(self, name, num_arguments, num_return_values=1):
         return FunctionPrinter(name, num_arguments, num_return_values)
 
@@ -1,150 +1,308 @@
 from rpython.rlib.rstruct.runpack import runpack
 from rpython.rlib.rarithmetic import r_longlong, r_ulonglong, r_int, intmask
 
+from rpython.rlib.jit import purefunction
+
+import bytecode
+import bytecode.constructor
 from bytecode.format import *
 
+class FixedWidthDecoder(object):
+    def __init__(self, buf, pos):
+        self.buf = buf
+        self.pos = pos
+
+    def at_end(self):
+        return self.pos >= len(self.buf)
+
+    def read(self, n):
+        start = self.pos
+        stop = start + n
+        if stop > len(self.buf):
+            raise EOFError()
+        assert start >= 0
+        assert stop >= start
+        self.pos = stop
+        return self.buf[start:stop]
+
+    def byte(self):
+        if self.pos >= len(self.buf):
+            raise EOFError()
+        b = ord(self.buf[self.pos])
+        self.pos += 1
+        return b
+
+    def uint(self):
+        return runpack('>Q', self.read(8))
+
+    def sint(self):
+        return runpack('>q', self.read(8))
+
+    def char(self):
+        return unichr(runpack('>I', self.read(4)))
+
+    def double(self):
+        return runpack('>d', self.read(8))
+
+class VarintDecoder(FixedWidthDecoder):
+    def uint(self):
+        result = r_ulonglong(0)
+        shift = 0
+        while True:
+            b = self.byte()
+            result |= r_ulonglong(b & 0x7f) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def sint(self):
+        n = self.uint()
+        return intmask(n >> 1) ^ -intmask(n & 1)
+
+    def char(self):
+        return unichr(intmask(self.uint()))
+
+def read_function(d, symbols, program_receiver):
+    name_n = intmask(d.uint())
+    name = symbols[name_n]
+    arguments_n = intmask(d.uint())
+    return_n = intmask(d.uint())
+
+    with program_receiver.function(name, arguments_n, return_n) as (function_receiver, _):
+        basic_block_n = intmask(d.uint())
+        for i in xrange(basic_block_n):
+            with function_receiver.basic_block() as basic_block_receiver:
+                while True:
+                    instruction_type = d.byte()
+                    if instruction_type == PHI:
+                        length = intmask(d.uint())
+                        inputs = []
+                        for i in xrange(length):
+                            block = d.uint()
+                            var = d.uint()
+                            inputs.append((block, var))
+                        basic_block_receiver.phi(inputs)
+                    elif instruction_type == COPY:
+                        basic_block_receiver.copy()
+                    elif instruction_type == MOVE:
+                        variable = d.uint()
+                        basic_block_receiver.move(variable)
+                    elif instruction_type == UNPACK:
+                        basic_block_receiver.unpack()
+                    elif instruction_type == CONST_BYTE:
+                        basic_block_receiver.constant_byte(d.read(1))
+                    elif instruction_type == CONST_CHAR:
+                        basic_block_receiver.constant_char(d.char())
+                    elif instruction_type == CONST_BYTESTRING:
+                        length = intmask(d.uint())
+                        basic_block_receiver.constant_bytestring(d.read(length))
+                    elif instruction_type == CONST_STRING:
+                        length = intmask(d.uint())
+                        basic_block_receiver.constant_string(d.read(length).decode('utf-8'))
+                    elif instruction_type == CONST_BOOL:
+                        basic_block_receiver.constant_bool(d.read(1) != '\0')
+                    elif instruction_type == CONST_INT:
+                        basic_block_receiver.constant_int(d.sint())
+                    elif instruction_type == CONST_UINT:
+                        basic_block_receiver.constant_uint(d.uint())
+                    elif instruction_type == CONST_DOUBLE:
+                        basic_block_receiver.constant_double(d.double())
+                    elif instruction_type == VOID:
+                        basic_block_receiver.void()
+                    elif instruction_type == OPERATION:
+                        operator_n = intmask(d.uint())
+                        operator = symbols[operator_n]
+                        arguments_n = intmask(d.uint())
+                        arguments = []
+                        for i in xrange(arguments_n):
+                            arguments.append(d.uint())
+                        basic_block_receiver.operation(operator, arguments)
+                    elif instruction_type == FUN_CALL:
+                        function_name_n = intmask(d.uint())
+                        function_name = symbols[function_name_n]
+                        arguments_n = intmask(d.uint())
+                        arguments = []
+                        for i in xrange(arguments_n):
+                            arguments.append(d.uint())
+                        basic_block_receiver.fun_call(function_name, arguments)
+                    elif instruction_type == SYS_CALL:
+                        function_name_n = intmask(d.uint())
+                        function_name = symbols[function_name_n]
+                        arguments_n = intmask(d.uint())
+                        arguments = []
+                        for i in xrange(arguments_n):
+                            arguments.append(d.uint())
+                        basic_block_receiver.sys_call(function_name, arguments)
+                    elif instruction_type == NEW_COROUTINE:
+                        function_name_n = intmask(d.uint())
+                        function_name = symbols[function_name_n]
+                        arguments_n = intmask(d.uint())
+                        arguments = []
+                        for i in xrange(arguments_n):
+                            arguments.append(d.uint())
+                        basic_block_receiver.new_coroutine(function_name, arguments)
+                    elif instruction_type == DEBUG:
+                        value = d.uint()
+                        basic_block_receiver.debug(value)
+                    elif instruction_type == LOAD:
+                        address = d.uint()
+                        basic_block_receiver.load(address)
+                    elif instruction_type == STORE:
+                        address = d.uint()
+                        variable = d.uint()
+                        basic_block_receiver.store(address, variable)
+                    elif instruction_type == GET:
+                        basic_block_receiver.get()
+                    elif instruction_type == PUT:
+                        variable = d.uint()
+                        basic_block_receiver.put(variable)
+                    elif instruction_type == RUN_COROUTINE:
+                        coroutine = d.uint()
+                        basic_block_receiver.run_coroutine(coroutine)
+                    elif instruction_type == YIELD:
+                        value = d.uint()
+                        basic_block_receiver.yield_(value)
+                    elif instruction_type == RESUME:
+                        coroutine = d.uint()
+                        value = d.uint()
+                        basic_block_receiver.resume(coroutine, value)
+                    elif instruction_type == TUPLE:
+                        arguments_n = intmask(d.uint())
+                        arguments = []
+                        for i in xrange(arguments_n):
+                            arguments.append(d.uint())
+                        basic_block_receiver.tuple(arguments)
+                    elif instruction_type == FIELD:
+                        variable = d.uint()
+                        index = intmask(d.uint())
+                        basic_block_receiver.field(variable, index)
+                    elif instruction_type == RET:
+                        variables = [d.uint() for i in xrange(return_n)]
+                        basic_block_receiver.ret_multiple(variables)
+                        break
+                    elif instruction_type == GOTO:
+                        block = d.uint()
+                        basic_block_receiver.goto(block)
+                        break
+                    elif instruction_type == CONDITIONAL:
+                        variable = d.uint()
+                        true_block = d.uint()
+                        false_block = d.uint()
+                        basic_block_receiver.conditional(variable, true_block, false_block)
+                        break
+                    elif instruction_type == SWITCH:
+                        variable = d.uint()
+                        default_block = d.uint()
+                        blocks_n = intmask(d.uint())
+                        blocks = []
+                        for i in xrange(blocks_n):
+                            blocks.append(d.uint())
+                        basic_block_receiver.switch(variable, blocks, default_block)
+                        break
+                    elif instruction_type == CATCH_FIRE_AND_DIE:
+                        basic_block_receiver.catch_fire_and_die()
+                        break
+                    elif instruction_type == THROW:
+                        exception = d.uint()
+                        basic_block_receiver.throw(exception)
+                        break
+                    else:
+                        raise NotImplementedError("unknown instruction type: %d" % instruction_type)
+
+def read_function_index(d, symbols):
+    offsets = []
+    n = intmask(d.uint())
+    for i in xrange(n):
+        name = symbols[intmask(d.uint())]
+        offset = intmask(d.uint())
+        offsets.append((name, offset))
+    return offsets
+
+def open_decoder(buf):
+    if len(buf) < 8:
+        raise NotImplementedError("not a bytecode file")
+    magic_start = runpack('>Q', buf[0:8])
+    if magic_start == MAGIC_START_V1:
+        return FixedWidthDecoder(buf, 8)
+    elif magic_start == MAGIC_START:
+        d = VarintDecoder(buf, 8)
+        version = intmask(d.uint())
+        if version > FORMAT_VERSION:
+            raise NotImplementedError("unsupported bytecode version: %d" % version)
+        return d
+    else:
+        raise NotImplementedError("not a bytecode file")
+
 def read_bytecode(fd, receiver):
-    magic_start = fd.read(8)
-    assert runpack('>Q', magic_start) == MAGIC_START
+    read_bytecode_buffer(fd.read(), receiver)
+
+def read_bytecode_buffer(buf, receiver):
+    d = open_decoder(buf)
     symbols = []
 
     with receiver as program_receiver:
         while True:
-            type_bytes = fd.read(1)
-            if len(type_bytes) == 0:
+            if d.at_end():
                 break
-            type = runpack('>B', type_bytes)
+            type = d.byte()
 
             if type == SYMBOL:
-                length = intmask(runpack('>Q', fd.read(8)))
-                value = fd.read(length)
+                length = intmask(d.uint())
+                value = d.read(length)
                 symbols.append(value)
+            elif type == MEMORY_SIZE:
+                program_receiver.memory_size(intmask(d.uint()))
+            elif type == FUNCTION_INDEX:
+                read_function_index(d, symbols)
             elif type == FUNCTION_START:
-                name_n = intmask(runpack('>Q', fd.read(8)))
-                name = symbols[name_n]
-                arguments_n = intmask(runpack('>Q', fd.read(8)))
-                return_n = intmask(runpack('>Q', fd.read(8)))
-
-                with program_receiver.function(name, arguments_n, return_n) as (function_receiver, _):
-                    basic_block_n = intmask(runpack('>Q', fd.read(8)))
-                    for i in xrange(basic_block_n):
-                        with function_receiver.basic_block() as basic_block_receiver:
-                            while True:
-                                instruction_type = runpack('>B', fd.read(1))
-                                if instruction_type == PHI:
-                                    length = intmask(runpack('>Q', fd.read(8)))
-                                    inputs = []
-                                    for i in xrange(length):
-                                        block = runpack('>Q', fd.read(8))
-                                        var = runpack('>Q', fd.read(8))
-                                        inputs.append((block, var))
-                                    basic_block_receiver.phi(inputs)
-                                elif instruction_type == COPY:
-                                    basic_block_receiver.copy()
-                                elif instruction_type == MOVE:
-                                    variable = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.move(variable)
-                                elif instruction_type == UNPACK:
-                                    basic_block_receiver.unpack()
-                                elif instruction_type == CONST_BYTE:
-                                    basic_block_receiver.constant_byte(fd.read(1))
-                                elif instruction_type == CONST_CHAR:
-                                    basic_block_receiver.constant_char(unichr(runpack('>I', fd.read(4))))
-                                elif instruction_type == CONST_BYTESTRING:
-                                    length = intmask(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.constant_bytestring(fd.read(length))
-                                elif instruction_type == CONST_STRING:
-                                    length = intmask(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.constant_string(fd.read(length).decode('utf-8'))
-                                elif instruction_type == CONST_BOOL:
-                                    basic_block_receiver.constant_bool(fd.read(1) != '\0')
-                                elif instruction_type == CONST_INT:
-                                    basic_block_receiver.constant_int(runpack('>q', fd.read(8)))
-                                elif instruction_type == CONST_UINT:
-                                    basic_block_receiver.constant_uint(runpack('>Q', fd.read(8)))
-                                elif instruction_type == CONST_DOUBLE:
-                                    basic_block_receiver.constant_double(runpack('>d', fd.read(8)))
-                                elif instruction_type == VOID:
-                                    basic_block_receiver.void()
-                                elif instruction_type == OPERATION:
-                                    operator_n = intmask(runpack('>Q', fd.read(8)))
-                                    operator = symbols[operator_n]
-                                    arguments_n = intmask(runpack('>Q', fd.read(8)))
-                                    arguments = []
-                                    for i in xrange(arguments_n):
-                                        arguments.append(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.operation(operator, arguments)
-                                elif instruction_type == FUN_CALL:
-                                    function_name_n = intmask(runpack('>Q', fd.read(8)))
-                                    function_name = symbols[function_name_n]
-                                    arguments_n = intmask(runpack('>Q', fd.read(8)))
-                                    arguments = []
-                                    for i in xrange(arguments_n):
-                                        arguments.append(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.fun_call(function_name, arguments)
-                                elif instruction_type == SYS_CALL:
-                                    function_name_n = intmask(runpack('>Q', fd.read(8)))
-                                    function_name = symbols[function_name_n]
-                                    arguments_n = intmask(runpack('>Q', fd.read(8)))
-                                    arguments = []
-                                    for i in xrange(arguments_n):
-                                        arguments.append(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.sys_call(function_name, arguments)
-                                elif instruction_type == NEW_COROUTINE:
-                                    function_name_n = intmask(runpack('>Q', fd.read(8)))
-                                    function_name = symbols[function_name_n]
-                                    arguments_n = intmask(runpack('>Q', fd.read(8)))
-                                    arguments = []
-                                    for i in xrange(arguments_n):
-                                        arguments.append(runpack('>Q', fd.read(8)))
-                                    basic_block_receiver.new_coroutine(function_name, arguments)
-                                elif instruction_type == DEBUG:
-                                    value = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.debug(value)
-                                elif instruction_type == LOAD:
-                                    address = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.load(address)
-                                elif instruction_type == STORE:
-                                    address = runpack('>Q', fd.read(8))
-                                    variable = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.store(address, variable)
-                                elif instruction_type == GET:
-                                    basic_block_receiver.get()
-                                elif instruction_type == PUT:
-                                    variable = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.put(variable)
-                                elif instruction_type == RUN_COROUTINE:
-                                    coroutine = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.run_coroutine(coroutine)
-                                elif instruction_type == YIELD:
-                                    value = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.yield_(value)
-                                elif instruction_type == RESUME:
-                                    coroutine = runpack('>Q', fd.read(8))
-                                    value = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.resume(coroutine, value)
-                                elif instruction_type == RET:
-                                    variables = [runpack('>Q', fd.read(8)) for i in xrange(return_n)]
-                                    basic_block_receiver.ret_multiple(variables)
-                                    break
-                                elif instruction_type == GOTO:
-                                    block = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.goto(block)
-                                    break
-                                elif instruction_type == CONDITIONAL:
-                                    variable = runpack('>Q', fd.read(8))
-                                    true_block = runpack('>Q', fd.read(8))
-                                    false_block = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.conditional(variable, true_block, false_block)
-                                    break
-                                elif instruction_type == CATCH_FIRE_AND_DIE:
-                                    basic_block_receiver.catch_fire_and_die()
-                                    break
-                                elif instruction_type == THROW:
-                                    exception = runpack('>Q', fd.read(8))
-                                    basic_block_receiver.throw(exception)
-                                    break
-                                else:
-                                    raise NotImplementedError("unknown instruction type: %d" % instruction_type)
+                read_function(d, symbols, program_receiver)
             else:
                 raise NotImplementedError()
+
+class LazyProgram(bytecode.Program):
+    def __init__(self, buf, symbols, offsets, linker, memory_size):
+        bytecode.Program.__init__(self, {}, memory_size)
+        self.buf = buf
+        self.symbols = symbols
+        self.offsets = offsets
+        self.linker = linker
+
+    @purefunction
+    def get_function(self, function):
+        if function in self.functions:
+            return self.functions[function]
+
+        d = VarintDecoder(self.buf, self.offsets[function])
+        assert d.byte() == FUNCTION_START
+        program_receiver = bytecode.constructor.ProgramConstructor(self.linker)
+        read_function(d, self.symbols, program_receiver)
+        f = program_receiver.get_program().functions[function]
+        self.functions[function] = f
+        return f
+
+# Programs with a function index are decoded one function at a time, the first
+# time each one is called. Older files are read eagerly.
+def load_program(fd, linker):
+    buf = fd.read()
+    d = open_decoder(buf)
+    symbols = []
+    memory_size = -1
+    while not d.at_end():
+        type = d.byte()
+        if type == SYMBOL:
+            length = intmask(d.uint())
+            symbols.append(d.read(length))
+        elif type == MEMORY_SIZE:
+            memory_size = intmask(d.uint())
+        elif type == FUNCTION_INDEX:
+            index = read_function_index(d, symbols)
+            offsets = {}
+            for name, offset in index:
+                offsets[name] = d.pos + offset
+            return LazyProgram(buf, symbols, offsets, linker, memory_size)
+        else:
+            break
+
+    constructor = bytecode.constructor.BytecodeConstructor(linker)
+    read_bytecode_buffer(buf, constructor)
+    return constructor.get_program()
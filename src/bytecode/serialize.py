@@ -51,6 +51,10 @@ def serialize_instruction(block_writer, instruction):
         block_writer.yield_(instruction.value)
     elif isinstance(instruction, bytecode.Resume):
         block_writer.resume(instruction.coroutine, instruction.value)
+    elif isinstance(instruction, bytecode.Tuple):
+        block_writer.tuple(instruction.arguments)
+    elif isinstance(instruction, bytecode.Field):
+        block_writer.field(instruction.variable, instruction.index)
     else:
         raise NotImplementedError('unknown instruction type: %s' % type(instruction))
 
@@ -64,6 +68,8 @@ def serialize_terminator(block_writer, terminator):
         true_block = terminator.true_block
         false_block = terminator.false_block
         block_writer.conditional(variable, true_block, false_block)
+    elif isinstance(terminator, bytecode.Switch):
+        block_writer.switch(terminator.variable, terminator.blocks, terminator.default_block)
     elif isinstance(terminator, bytecode.CatchFireAndDie):
         block_writer.catch_fire_and_die()
     elif isinstance(terminator, bytecode.Throw):
@@ -84,6 +90,8 @@ def serialize_function(function_writer, function):
 
 def serialize_program(program_writer, program):
     with program_writer as writer:
+        if program.memory_size >= 0:
+            writer.memory_size(program.memory_size)
         for name, function in program.functions.iteritems():
             num_arguments = function.num_arguments
             with writer.function(name, num_arguments) as (function_writer, _):
@@ -4,6 +4,20 @@ import binascii
 
 from bytecode.format import *
 
+def pack_uint(n):
+    assert n >= 0
+    output = []
+    while n >= 0x80:
+        output.append(chr((n & 0x7f) | 0x80))
+        n >>= 7
+    output.append(chr(n))
+    return ''.join(output)
+
+def pack_int(n):
+    if n < 0:
+        return pack_uint(((-n - 1) << 1) | 1)
+    return pack_uint(n << 1)
+
 class BasicBlockWriter(object):
     def __init__(self, function, writer, index):
         self.function = function
@@ -23,11 +37,11 @@ class BasicBlockWriter(object):
         assert isinstance(inputs, list)
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', PHI))
-        self.block_writer.write(struct.pack('>Q', len(inputs)))
+        self.block_writer.write(pack_uint(len(inputs)))
 
         for block, var in inputs:
-            self.block_writer.write(struct.pack('>Q', block))
-            self.block_writer.write(struct.pack('>Q', var))
+            self.block_writer.write(pack_uint(block))
+            self.block_writer.write(pack_uint(var))
         return self.function.create_variable()
 
     def copy(self):
@@ -38,7 +52,7 @@ class BasicBlockWriter(object):
     def move(self, variable):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', MOVE))
-        self.block_writer.write(struct.pack('>Q', variable))
+        self.block_writer.write(pack_uint(variable))
         return self.function.create_variable()
 
     def unpack(self):
@@ -63,13 +77,13 @@ class BasicBlockWriter(object):
         assert not self.terminated
         assert len(value) == 1
         self.block_writer.write(struct.pack('>B', CONST_CHAR))
-        self.block_writer.write(struct.pack('>I', ord(value)))
+        self.block_writer.write(pack_uint(ord(value)))
         return self.function.create_variable()
 
     def constant_bytestring(self, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', CONST_BYTESTRING))
-        self.block_writer.write(struct.pack('>Q', len(value)))
+        self.block_writer.write(pack_uint(len(value)))
         self.block_writer.write(value)
         return self.function.create_variable()
 
@@ -77,20 +91,20 @@ class BasicBlockWriter(object):
         assert not self.terminated
         bytes = value.encode('utf-8')
         self.block_writer.write(struct.pack('>B', CONST_STRING))
-        self.block_writer.write(struct.pack('>Q', len(bytes)))
+        self.block_writer.write(pack_uint(len(bytes)))
         self.block_writer.write(bytes)
         return self.function.create_variable()
 
     def constant_int(self, value):
         assert not self.terminated
-        self.block_writer.write(struct.pack('>B', CONST_UINT))
-        self.block_writer.write(struct.pack('>q', value))
+        self.block_writer.write(struct.pack('>B', CONST_INT))
+        self.block_writer.write(pack_int(value))
         return self.function.create_variable()
 
     def constant_uint(self, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', CONST_UINT))
-        self.block_writer.write(struct.pack('>Q', value))
+        self.block_writer.write(pack_uint(value))
         return self.function.create_variable()
 
     def constant_double(self, value):
@@ -109,9 +123,9 @@ class BasicBlockWriter(object):
         self.block_writer.write(struct.pack('>B', OPERATION))
         self.block_writer.write(self.writer.symbol(operator))
 
-        self.block_writer.write(struct.pack('>Q', len(arguments)))
+        self.block_writer.write(pack_uint(len(arguments)))
         for arg in arguments:
-            self.block_writer.write(struct.pack('>Q', arg))
+            self.block_writer.write(pack_uint(arg))
         return self.function.create_variable()
 
     def sys_call(self, function, arguments):
@@ -119,9 +133,9 @@ class BasicBlockWriter(object):
         self.block_writer.write(struct.pack('>B', SYS_CALL))
         self.block_writer.write(self.writer.symbol(function))
 
-        self.block_writer.write(struct.pack('>Q', len(arguments)))
+        self.block_writer.write(pack_uint(len(arguments)))
         for arg in arguments:
-            self.block_writer.write(struct.pack('>Q', arg))
+            self.block_writer.write(pack_uint(arg))
         return self.function.create_variable()
 
     def fun_call(self, function, arguments):
@@ -129,9 +143,9 @@ class BasicBlockWriter(object):
         self.block_writer.write(struct.pack('>B', FUN_CALL))
         self.block_writer.write(self.writer.symbol(function))
 
-        self.block_writer.write(struct.pack('>Q', len(arguments)))
+        self.block_writer.write(pack_uint(len(arguments)))
         for arg in arguments:
-            self.block_writer.write(struct.pack('>Q', arg))
+            self.block_writer.write(pack_uint(arg))
         return self.function.create_variable()
 
     def new_coroutine(self, function, arguments):
@@ -139,28 +153,28 @@ class BasicBlockWriter(object):
         self.block_writer.write(struct.pack('>B', NEW_COROUTINE))
         self.block_writer.write(self.writer.symbol(function))
 
-        self.block_writer.write(struct.pack('>Q', len(arguments)))
+        self.block_writer.write(pack_uint(len(arguments)))
         for arg in arguments:
-            self.block_writer.write(struct.pack('>Q', arg))
+            self.block_writer.write(pack_uint(arg))
         return self.function.create_variable()
 
     def debug(self, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', DEBUG))
-        self.block_writer.write(struct.pack('>Q', value))
+        self.block_writer.write(pack_uint(value))
         return self.function.create_variable()
 
     def load(self, address):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', LOAD))
-        self.block_writer.write(struct.pack('>Q', address))
+        self.block_writer.write(pack_uint(address))
         return self.function.create_variable()
 
     def store(self, address, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', STORE))
-        self.block_writer.write(struct.pack('>Q', address))
-        self.block_writer.write(struct.pack('>Q', value))
+        self.block_writer.write(pack_uint(address))
+        self.block_writer.write(pack_uint(value))
         return self.function.create_variable()
 
     def get(self):
@@ -171,26 +185,41 @@ class BasicBlockWriter(object):
     def put(self, variable):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', PUT))
-        self.block_writer.write(struct.pack('>Q', variable))
+        self.block_writer.write(pack_uint(variable))
         return self.function.create_variable()
 
     def run_coroutine(self, coroutine):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', RUN_COROUTINE))
-        self.block_writer.write(struct.pack('>Q', coroutine))
+        self.block_writer.write(pack_uint(coroutine))
         return self.function.create_variable()
 
     def yield_(self, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', YIELD))
-        self.block_writer.write(struct.pack('>Q', value))
+        self.block_writer.write(pack_uint(value))
         return self.function.create_variable()
 
     def resume(self, coroutine, value):
         assert not self.terminated
         self.block_writer.write(struct.pack('>B', RESUME))
-        self.block_writer.write(struct.pack('>Q', coroutine))
-        self.block_writer.write(struct.pack('>Q', value))
+        self.block_writer.write(pack_uint(coroutine))
+        self.block_writer.write(pack_uint(value))
+        return self.function.create_variable()
+
+    def tuple(self, arguments):
+        assert not self.terminated
+        self.block_writer.write(struct.pack('>B', TUPLE))
+        self.block_writer.write(pack_uint(len(arguments)))
+        for arg in arguments:
+            self.block_writer.write(pack_uint(arg))
+        return self.function.create_variable()
+
+    def field(self, variable, index):
+        assert not self.terminated
+        self.block_writer.write(struct.pack('>B', FIELD))
+        self.block_writer.write(pack_uint(variable))
+        self.block_writer.write(pack_uint(index))
         return self.function.create_variable()
 
     def terminator(self):
@@ -202,7 +231,7 @@ class BasicBlockWriter(object):
         assert len(variables) == self.function.num_return_values
         self.block_writer.write(struct.pack('>B', RET))
         for variable in variables:
-            self.block_writer.write(struct.pack('>Q', variable))
+            self.block_writer.write(pack_uint(variable))
 
     def ret(self, variable):
         return self.ret_multiple([variable])
@@ -210,14 +239,23 @@ class BasicBlockWriter(object):
     def goto(self, block):
         self.terminator()
         self.block_writer.write(struct.pack('>B', GOTO))
-        self.block_writer.write(struct.pack('>Q', block))
+        self.block_writer.write(pack_uint(block))
 
     def conditional(self, variable, true_block, false_block):
         self.terminator()
         self.block_writer.write(struct.pack('>B', CONDITIONAL))
-        self.block_writer.write(struct.pack('>Q', variable))
-        self.block_writer.write(struct.pack('>Q', true_block))
-        self.block_writer.write(struct.pack('>Q', false_block))
+        self.block_writer.write(pack_uint(variable))
+        self.block_writer.write(pack_uint(true_block))
+        self.block_writer.write(pack_uint(false_block))
+
+    def switch(self, variable, blocks, default_block):
+        self.terminator()
+        self.block_writer.write(struct.pack('>B', SWITCH))
+        self.block_writer.write(pack_uint(variable))
+        self.block_writer.write(pack_uint(default_block))
+        self.block_writer.write(pack_uint(len(blocks)))
+        for block in blocks:
+            self.block_writer.write(pack_uint(block))
 
     def catch_fire_and_die(self):
         self.terminator()
@@ -226,7 +264,7 @@ class BasicBlockWriter(object):
     def throw(self, exception):
         self.terminator()
         self.block_writer.write(struct.pack('>B', THROW))
-        self.block_writer.write(struct.pack('>Q', exception))
+        self.block_writer.write(pack_uint(exception))
 
     def write_out(self):
         self.writer.write(self.block_writer.getvalue())
@@ -250,14 +288,12 @@ class FunctionWriter(object):
 
     def __exit__(self, type, value, traceback):
         if not value:
-            name_symbol = self.writer.symbol(self.name)
-            self.writer.write(struct.pack('>B', FUNCTION_START))
-            self.writer.write(name_symbol)
+            self.writer.function_start(self.name)
 
-            self.writer.write(struct.pack('>Q', self.num_arguments))
-            self.writer.write(struct.pack('>Q', self.num_return_values))
+            self.writer.write(pack_uint(self.num_arguments))
+            self.writer.write(pack_uint(self.num_return_values))
 
-            self.writer.write(struct.pack('>Q', len(self.basic_blocks)))
+            self.writer.write(pack_uint(len(self.basic_blocks)))
             for basic_block in self.basic_blocks:
                 basic_block.write_out()
 
@@ -270,6 +306,9 @@ class ProgramWriter(object):
     def __init__(self, writer):
         self.writer = writer
 
+    def memory_size(self, n):
+        self.writer.memory_size = n
+
     def function(self, name, num_arguments, num_return_values=1):
         return FunctionWriter(self.writer, name, num_arguments, num_return_values)
 
@@ -278,26 +317,49 @@ class BytecodeWriter(object):
         self.started = False
         self.fd = fd
         self.symbols = {}
-
-        self.write(struct.pack('>Q', MAGIC_START))
+        self.symbol_writer = StringIO.StringIO()
+        self.body_writer = StringIO.StringIO()
+        self.function_offsets = []
+        self.memory_size = None
 
     def write(self, bytes):
-        self.fd.write(bytes)
+        self.body_writer.write(bytes)
 
     def symbol(self, name):
         if name in self.symbols:
             return self.symbols[name]
-        self.write(struct.pack('>B', SYMBOL))
-        self.write(struct.pack('>Q', len(name)))
-        self.write(name)
-        n = struct.pack('>Q', len(self.symbols))
+        self.symbol_writer.write(struct.pack('>B', SYMBOL))
+        self.symbol_writer.write(pack_uint(len(name)))
+        self.symbol_writer.write(name)
+        n = pack_uint(len(self.symbols))
         self.symbols[name] = n
         return n
 
+    def function_start(self, name):
+        name_symbol = self.symbol(name)
+        self.function_offsets.append((name_symbol, self.body_writer.tell()))
+        self.write(struct.pack('>B', FUNCTION_START))
+        self.write(name_symbol)
+
     def __enter__(self):
         assert not self.started
         self.started = True
         return ProgramWriter(self)
 
     def __exit__(self, type, value, traceback):
-        pass
+        if not value:
+            self.fd.write(struct.pack('>Q', MAGIC_START))
+            self.fd.write(pack_uint(FORMAT_VERSION))
+            self.fd.write(self.symbol_writer.getvalue())
+
+            if self.memory_size is not None:
+                self.fd.write(struct.pack('>B', MEMORY_SIZE))
+                self.fd.write(pack_uint(self.memory_size))
+
+            self.fd.write(struct.pack('>B', FUNCTION_INDEX))
+            self.fd.write(pack_uint(len(self.function_offsets)))
+            for name_symbol, offset in self.function_offsets:
+                self.fd.write(name_symbol)
+                self.fd.write(pack_uint(offset))
+
+            self.fd.write(self.body_writer.getvalue())
@@ -46,13 +46,29 @@ class SysCall(object):
     def register(self):
         sys_calls[self.name] = self
 
-def sys_call(name):
+    def call(self, arguments):
+        raise NotImplementedError()
+
+    # Run before the sys call once coroutines are being scheduled. Raises
+    # WouldBlock if performing the sys call now would block the VM.
+    def wait(self, arguments):
+        pass
+
+# Sys calls the VM answers itself. The linker hands them out by name, and
+# whatever answers them recognises them by identity.
+class BuiltinSysCall(SysCall):
+    def __init__(self, name):
+        self.name = name
+
+def sys_call(name, wait=None):
     def decorator(f):
         class DecoratedSysCall(SysCall):
             def __init__(self):
                 self.name = name
 
             call = f
+        if wait is not None:
+            DecoratedSysCall.wait = wait
         DecoratedSysCall().register()
     return decorator
 
@@ -90,6 +106,11 @@ class Data(object):
     def hash(self):
         raise NotImplementedError()
 
+    # The file descriptor behind values that wrap one, so they can be
+    # registered with epoll.
+    def fileno(self):
+        raise NotImplementedError()
+
 def load(fd):
     id = fd.read(8)
     return type_by_id[id].load(fd)
@@ -99,6 +120,7 @@ def register_all():
         cls.register()
 
 class Int(Data):
+    _immutable_fields_ = ['n']
     def __init__(self, n):
         self.n = n
 
@@ -146,6 +168,7 @@ class Double(Data):
         return basic_block.constant_double(self.d)
 
 class Bool(Data):
+    _immutable_fields_ = ['b']
     def __init__(self, b):
         self.b = b
 
@@ -155,8 +178,7 @@ class Bool(Data):
 
     @staticmethod
     def load(fd):
-        n = runpack('>Q', fd.read(8))
-        return Bool(fd.read(1) != '\0')
+        return new_bool(fd.read(1) != '\0')
 
     def write_out(self, basic_block):
         return basic_block.constant_bool(self.b)
@@ -170,6 +192,30 @@ class Bool(Data):
     def hash(self):
         return compute_hash(self.b)
 
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1024
+
+small_ints = [Int(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX)]
+small_uints = [UInt(i) for i in range(SMALL_INT_MAX)]
+
+def new_int(n):
+    if SMALL_INT_MIN <= n < SMALL_INT_MAX:
+        return small_ints[n - SMALL_INT_MIN]
+    return Int(n)
+
+def new_uint(n):
+    if 0 <= n < SMALL_INT_MAX:
+        return small_uints[n]
+    return UInt(n)
+
+true = Bool(True)
+false = Bool(False)
+
+def new_bool(b):
+    if b:
+        return true
+    return false
+
 class Invalid(Data):
     def write_out(self, basic_block):
         raise Exception()
@@ -251,17 +297,46 @@ class Char(Data):
         return compute_hash(self.b)
 
 class ByteString(Data):
-    def __init__(self, v):
+    def __init__(self, v, start=0, stop=-1):
         assert not v is None
-        self.v = v
+        if stop < 0:
+            stop = len(v)
+        assert 0 <= start <= stop <= len(v)
+        self.buf = v
+        self.start = start
+        self.stop = stop
+
+    def length(self):
+        length = self.stop - self.start
+        assert length >= 0
+        return length
+
+    def byte_at(self, i):
+        assert 0 <= i < self.length()
+        return self.buf[self.start + i]
+
+    def slice(self, start, stop):
+        assert 0 <= start <= stop <= self.length()
+        return ByteString(self.buf, self.start + start, self.start + stop)
+
+    def value(self):
+        if self.start != 0 or self.stop != len(self.buf):
+            start = self.start
+            stop = self.stop
+            assert start >= 0
+            assert stop >= start
+            self.buf = self.buf[start:stop]
+            self.start = 0
+            self.stop = len(self.buf)
+        return self.buf
 
     def debug(self):
-        return u'b\"%s\"' % self.v.decode('utf-8')
+        return u'b\"%s\"' % self.value().decode('utf-8')
 
     def persist(self, fd):
         fd.write(self.type_id)
-        fd.write(pack_uint(len(self.v)))
-        fd.write(self.v)
+        fd.write(pack_uint(self.length()))
+        fd.write(self.value())
 
     @staticmethod
     def load(fd):
@@ -269,30 +344,61 @@ class ByteString(Data):
         return ByteString(fd.read(n))
 
     def write_out(self, basic_block):
-        return basic_block.constant_bytestring(self.v)
+        return basic_block.constant_bytestring(self.value())
 
     def __repr__(self):
-        return repr(self.v)
+        return repr(self.value())
 
     def eq(self, other):
-        return isinstance(other, ByteString) and self.v == other.v
+        if not isinstance(other, ByteString) or self.length() != other.length():
+            return False
+        return self.value() == other.value()
 
     def hash(self):
-        return compute_hash(self.v)
+        return compute_hash(self.value())
 
 class String(Data):
-    def __init__(self, v):
-        self.v = v
+    def __init__(self, v, start=0, stop=-1):
+        if stop < 0:
+            stop = len(v)
+        assert 0 <= start <= stop <= len(v)
+        self.buf = v
+        self.start = start
+        self.stop = stop
+
+    def length(self):
+        length = self.stop - self.start
+        assert length >= 0
+        return length
+
+    def char_at(self, i):
+        assert 0 <= i < self.length()
+        return self.buf[self.start + i]
+
+    def slice(self, start, stop):
+        assert 0 <= start <= stop <= self.length()
+        return String(self.buf, self.start + start, self.start + stop)
+
+    def value(self):
+        if self.start != 0 or self.stop != len(self.buf):
+            start = self.start
+            stop = self.stop
+            assert start >= 0
+            assert stop >= start
+            self.buf = self.buf[start:stop]
+            self.start = 0
+            self.stop = len(self.buf)
+        return self.buf
 
     def debug(self):
-        return u'\"%s\"' % self.v
+        return u'\"%s\"' % self.value()
 
     def write_out(self, basic_block):
-        return basic_block.constant_string(self.v)
+        return basic_block.constant_string(self.value())
 
     def persist(self, fd):
         fd.write(self.type_id)
-        v = self.v.encode('utf-8')
+        v = self.value().encode('utf-8')
         fd.write(pack_uint(len(v)))
         fd.write(v)
 
@@ -302,10 +408,45 @@ class String(Data):
         return String(fd.read(n).decode('utf-8'))
 
     def __repr__(self):
-        return repr(self.v)
+        return repr(self.value())
 
     def eq(self, other):
-        return isinstance(other, String) and self.v == other.v
+        if not isinstance(other, String) or self.length() != other.length():
+            return False
+        return self.value() == other.value()
 
     def hash(self):
-        return compute_hash(self.v)
+        return compute_hash(self.value())
+
+class Tuple(Data):
+    _immutable_fields_ = ['values[*]']
+    def __init__(self, values):
+        self.values = list(values)
+
+    def debug(self):
+        return u'(%s)' % u', '.join([value.debug() for value in self.values])
+
+    def length(self):
+        return len(self.values)
+
+    def get(self, i):
+        return self.values[i]
+
+    def persist(self, fd):
+        fd.write(self.type_id)
+        fd.write(pack_uint(len(self.values)))
+        for value in self.values:
+            value.persist(fd)
+
+    @staticmethod
+    def load(fd):
+        n = intmask(runpack('>Q', fd.read(8)))
+        return Tuple([load(fd) for i in xrange(n)])
+
+    def eq(self, other):
+        if not isinstance(other, Tuple) or len(self.values) != len(other.values):
+            return False
+        for i in xrange(len(self.values)):
+            if not self.values[i].eq(other.values[i]):
+                return False
+        return True
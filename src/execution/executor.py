@@ -1,13 +1,22 @@
 from rpython.rlib.jit import JitDriver, hint, unroll_safe
 import bytecode
+import bytecode.constructor
+from bytecode import format
 import data
 import operators
 import pdb
+from data import operator
+import sys_calls
+from sys_calls.blocking import WouldBlock
+from sys_calls.stdout import output
+from execution.scheduler import Scheduler, Task
 
 @unroll_safe
 def activation_record(function, arguments):
     assert function.num_arguments == len(arguments)
-    values = arguments + [data.invalid for i in xrange(function.n_values)]
+    values = [data.invalid] * function.frame_size
+    for i in xrange(len(arguments)):
+        values[i] = arguments[i]
     last_block_index = 0
     current_block_index = 0
     pc = 0
@@ -23,6 +32,11 @@ def resolve_variable(values, var):
 def resolve_variable_list(values, variables):
     return [resolve_variable(values, var) for var in variables]
 
+@unroll_safe
+def move_arguments(values, variables, target):
+    for i in xrange(len(variables)):
+        target[i] = resolve_variable(values, variables[i])
+
 def next_instruction(function, current_block_index, pc):
     current_block = function.get_block(current_block_index)
     if current_block.num_instructions() <= pc:
@@ -72,24 +86,149 @@ class ActivationFrame(object):
         self.current_block_index = current_block_index
         self.pc = pc
 
+# Service attribute slots. Programs that declare how many slots they use get
+# exactly that many; otherwise memory grows as it's stored to.
+class Memory(object):
+    def __init__(self, size):
+        self.growable = size < 0
+        if self.growable:
+            size = 0
+        self.slots = [data.invalid] * size
+
+    def load(self, address):
+        if address >= len(self.slots):
+            raise Exception('memory address out of range: %d' % address)
+        return self.slots[address]
+
+    def store(self, address, value):
+        if address >= len(self.slots):
+            if not self.growable:
+                raise Exception('memory address out of range: %d' % address)
+            self.slots.extend([data.invalid] * (address + 1 - len(self.slots)))
+        self.slots[address] = value
+
 class Coroutine(data.Data):
     def __init__(self):
-        self.stack = []
+        self.frames = []
+        self.depth = 0
+        self.registers = []
         self.done = False
         self.var = data.void
 
+    def has_frames(self):
+        return self.depth > 0
+
+    # Frame objects are reused, so the caller must read the fields of a frame
+    # returned by pop_frame before pushing another one.
+    def push_frame(self, values, function, last_block_index, current_block_index, pc):
+        if self.depth < len(self.frames):
+            frame = self.frames[self.depth]
+            frame.values = values
+            frame.function = function
+            frame.last_block_index = last_block_index
+            frame.current_block_index = current_block_index
+            frame.pc = pc
+        else:
+            self.frames.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+        self.depth += 1
+
+    def pop_frame(self):
+        assert self.depth > 0
+        self.depth -= 1
+        return self.frames[self.depth]
+
+    # Every call made at a given depth of this coroutine's stack reuses the
+    # same list of values, which is cleared again when the callee returns.
+    def acquire_values(self, size):
+        index = self.depth - 1
+        assert index >= 0
+        if index < len(self.registers):
+            values = self.registers[index]
+            if len(values) >= size:
+                return values
+            values = [data.invalid] * size
+            self.registers[index] = values
+            return values
+        values = [data.invalid] * size
+        self.registers.append(values)
+        return values
+
+    def release_values(self, values, size):
+        for i in xrange(size):
+            values[i] = data.invalid
+
     def print_backtrace(self):
-        print ''
-        print 'backtrace:'
-        for frame in self.stack:
+        output.write('\nbacktrace:\n')
+        for i in xrange(self.depth):
+            frame = self.frames[i]
             values = frame.values
             function = frame.function
             last_block_index = frame.last_block_index
             current_block_index = frame.current_block_index
             pc = frame.pc
             next_value = function.block_value_offsets[current_block_index] + pc
-            print '  %s:%d' % (function.name, next_value)
-        print ''
+            output.write('  %s:%d\n' % (function.name, next_value))
+        output.write('\n')
+        output.flush()
+
+@operator('is_done')
+def call(self, arguments):
+    assert len(arguments) == 1
+    c = arguments[0]
+    assert isinstance(c, Coroutine)
+    return [data.new_bool(c.done)]
+
+spawn = data.BuiltinSysCall('spawn')
+
+class RegistryLinker(bytecode.constructor.Linker):
+    # Constant instructions retire shared values built once here. Strings and
+    # byte strings are pooled so equal literals in different functions share
+    # a single object.
+    def __init__(self):
+        self.strings = {}
+        self.bytestrings = {}
+
+    def operator(self, name):
+        if not name in data.operators:
+            raise Exception('unknown operator: %s' % name)
+        return data.operators[name]
+
+    def sys_call(self, name):
+        if name == 'spawn':
+            return spawn
+        if name == 'bytecode_file':
+            return sys_calls.bytecode_file
+        if not name in data.sys_calls:
+            raise Exception('unknown sys call: %s' % name)
+        return data.sys_calls[name]
+
+    def constant_bool(self, value):
+        return data.new_bool(value)
+
+    def constant_int(self, value):
+        return data.new_int(value)
+
+    def constant_uint(self, value):
+        return data.new_uint(value)
+
+    def constant_double(self, value):
+        return data.Double(value)
+
+    def constant_byte(self, value):
+        return data.Byte(value)
+
+    def constant_char(self, value):
+        return data.Char(value)
+
+    def constant_string(self, value):
+        if not value in self.strings:
+            self.strings[value] = data.String(value)
+        return self.strings[value]
+
+    def constant_bytestring(self, value):
+        if not value in self.bytestrings:
+            self.bytestrings[value] = data.ByteString(value)
+        return self.bytestrings[value]
 
 def get_location(current_block_index, last_block_index, pc, function, program, sys_caller):
     name = function.name
@@ -110,6 +249,7 @@ jitdriver = JitDriver(
                         'coroutine',
                         'coroutine_stack',
                         'memory',
+                        'scheduler',
                         'values',
                     ],
                     get_printable_location=get_location
@@ -117,21 +257,12 @@ jitdriver = JitDriver(
 
 def execute(sys_caller, program, arguments):
     coroutine_stack = []
-    memory = [data.invalid] * 1024**2
-
-    for function_name, function in program.functions.iteritems():
-        block_value_offsets = []
-        n_values = 0
-        for block in function.blocks:
-            block_value_offsets.append(function.num_arguments + n_values)
-            n_values += block.num_instructions()
-
-        function.n_values = n_values
-        function.block_value_offsets = block_value_offsets
+    memory = Memory(program.memory_size)
+    scheduler = Scheduler(sys_caller)
 
     coroutine = Coroutine()
 
-    frame = activation_record(program.functions['$main'], arguments)
+    frame = activation_record(program.get_function('$main'), arguments)
     values = frame.values
     function = frame.function
     last_block_index = frame.last_block_index
@@ -148,106 +279,160 @@ def execute(sys_caller, program, arguments):
                 coroutine=coroutine,
                 coroutine_stack=coroutine_stack,
                 memory=memory,
+                scheduler=scheduler,
                 values=values,
             )
         instr = next_instruction(function, current_block_index, pc)
         if instr:
-            if isinstance(instr, bytecode.Phi):
+            op = instr.opcode
+            if op == format.PHI:
+                assert isinstance(instr, bytecode.Phi)
                 value = resolve_variable(values, instr.get_input(last_block_index))
                 pc = retire(values, function, current_block_index, pc, value)
-            elif isinstance(instr, bytecode.Copy):
+            elif op == format.COPY:
                 value = copy(values, function, current_block_index, pc)
                 pc = retire(values, function, current_block_index, pc, value)
-            elif isinstance(instr, bytecode.Move):
+            elif op == format.MOVE:
+                assert isinstance(instr, bytecode.Move)
                 value = resolve_variable(values, instr.variable)
                 pc = retire(values, function, current_block_index, pc, value)
-            elif isinstance(instr, bytecode.Operation):
+            elif op == format.OPERATION:
+                assert isinstance(instr, bytecode.Operation)
+                arguments = resolve_variable_list(values, instr.arguments)
+                v = instr.handler.call(arguments)
+                pc = retire_multiple(values, function, current_block_index, pc, v)
+            elif op == format.SYS_CALL:
+                assert isinstance(instr, bytecode.SysCall)
                 arguments = resolve_variable_list(values, instr.arguments)
-                if instr.operator == 'is_done':
-                    assert len(instr.arguments) == 1
+                if instr.handler is spawn:
+                    assert len(arguments) == 1
                     c = arguments[0]
                     assert isinstance(c, Coroutine)
-                    value = data.Bool(c.done)
-                    pc = retire(values, function, current_block_index, pc, value)
+                    scheduler.spawn(c)
+                    pc = retire(values, function, current_block_index, pc, data.void)
                 else:
-                    operator = operators.operator(instr.operator)
-                    v = operator.call(arguments)
-                    pc = retire_multiple(values, function, current_block_index, pc, v)
-            elif isinstance(instr, bytecode.SysCall):
-                arguments = resolve_variable_list(values, instr.arguments)
-                v = sys_caller.sys_call(instr.function, arguments)
-                pc = retire_multiple(values, function, current_block_index, pc, v)
-            elif isinstance(instr, bytecode.FunctionCall):
-                arguments = resolve_variable_list(values, instr.arguments)
-                coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
-                frame = activation_record(program.get_function(instr.function), arguments)
-                values = frame.values
-                function = frame.function
-                last_block_index = frame.last_block_index
-                current_block_index = frame.current_block_index
-                pc = frame.pc
-            elif isinstance(instr, bytecode.NewCoroutine):
-                arguments = resolve_variable_list(values, instr.arguments)
+                    try:
+                        v = sys_caller.sys_call(instr.handler, arguments)
+                    except WouldBlock as e:
+                        coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
+                        task = Task(coroutine, coroutine_stack)
+                        task.handler = instr.handler
+                        task.arguments = arguments
+                        scheduler.park(task, e.fd, e.events)
+                        task = scheduler.next_task()
+                        assert task is not None
+                        coroutine = task.coroutine
+                        coroutine_stack = task.coroutine_stack
+                        frame = coroutine.pop_frame()
+                        values = frame.values
+                        function = frame.function
+                        last_block_index = frame.last_block_index
+                        current_block_index = frame.current_block_index
+                        pc = frame.pc
+                        if task.results is not None:
+                            pc = retire_multiple(values, function, current_block_index, pc, task.results)
+                    else:
+                        pc = retire_multiple(values, function, current_block_index, pc, v)
+            elif op == format.FUN_CALL:
+                assert isinstance(instr, bytecode.FunctionCall)
+                callee = program.get_function(instr.function)
+                assert callee.num_arguments == len(instr.arguments)
+                coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
+                callee_values = coroutine.acquire_values(callee.frame_size)
+                move_arguments(values, instr.arguments, callee_values)
+                values = callee_values
+                function = callee
+                last_block_index = 0
+                current_block_index = 0
+                pc = 0
+            elif op == format.NEW_COROUTINE:
+                assert isinstance(instr, bytecode.NewCoroutine)
                 f = program.get_function(instr.function)
+                assert f.num_arguments == len(instr.arguments)
+                coroutine_values = [data.invalid] * f.frame_size
+                move_arguments(values, instr.arguments, coroutine_values)
                 c = Coroutine()
-                c.stack.append(activation_record(f, arguments))
+                c.push_frame(coroutine_values, f, 0, 0, 0)
                 pc = retire(values, function, current_block_index, pc, c)
-            elif isinstance(instr, bytecode.Debug):
+            elif op == format.DEBUG:
+                assert isinstance(instr, bytecode.Debug)
                 value = resolve_variable(values, instr.value)
-                print value.debug()
+                output.write((value.debug() + u'\n').encode('utf-8'))
                 pc = retire(values, function, current_block_index, pc, data.void)
-            elif isinstance(instr, bytecode.ConstantBool):
-                pc = retire(values, function, current_block_index, pc, data.Bool(instr.value))
-            elif isinstance(instr, bytecode.ConstantByte):
-                pc = retire(values, function, current_block_index, pc, data.Byte(instr.value))
-            elif isinstance(instr, bytecode.ConstantChar):
-                pc = retire(values, function, current_block_index, pc, data.Char(instr.value))
-            elif isinstance(instr, bytecode.ConstantByteString):
-                pc = retire(values, function, current_block_index, pc, data.ByteString(instr.value))
-            elif isinstance(instr, bytecode.ConstantString):
-                pc = retire(values, function, current_block_index, pc, data.String(instr.value))
-            elif isinstance(instr, bytecode.ConstantInt):
-                pc = retire(values, function, current_block_index, pc, data.Int(instr.value))
-            elif isinstance(instr, bytecode.ConstantUInt):
-                pc = retire(values, function, current_block_index, pc, data.UInt(instr.value))
-            elif isinstance(instr, bytecode.ConstantDouble):
-                pc = retire(values, function, current_block_index, pc, data.Double(instr.value))
-            elif isinstance(instr, bytecode.Void):
+            elif op == format.TUPLE:
+                assert isinstance(instr, bytecode.Tuple)
+                arguments = resolve_variable_list(values, instr.arguments)
+                pc = retire(values, function, current_block_index, pc, data.Tuple(arguments))
+            elif op == format.FIELD:
+                assert isinstance(instr, bytecode.Field)
+                t = resolve_variable(values, instr.variable)
+                assert isinstance(t, data.Tuple)
+                pc = retire(values, function, current_block_index, pc, t.get(instr.index))
+            elif op == format.CONST_BOOL:
+                assert isinstance(instr, bytecode.ConstantBool)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_BYTE:
+                assert isinstance(instr, bytecode.ConstantByte)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_CHAR:
+                assert isinstance(instr, bytecode.ConstantChar)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_BYTESTRING:
+                assert isinstance(instr, bytecode.ConstantByteString)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_STRING:
+                assert isinstance(instr, bytecode.ConstantString)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_INT:
+                assert isinstance(instr, bytecode.ConstantInt)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_UINT:
+                assert isinstance(instr, bytecode.ConstantUInt)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.CONST_DOUBLE:
+                assert isinstance(instr, bytecode.ConstantDouble)
+                pc = retire(values, function, current_block_index, pc, instr.constant)
+            elif op == format.VOID:
                 pc = retire(values, function, current_block_index, pc, data.void)
-            elif isinstance(instr, bytecode.Load):
+            elif op == format.LOAD:
+                assert isinstance(instr, bytecode.Load)
                 address = resolve_variable(values, instr.address)
                 assert isinstance(address, data.UInt)
-                dat = memory[address.n]
+                dat = memory.load(address.n)
                 pc = retire(values, function, current_block_index, pc, dat)
-            elif isinstance(instr, bytecode.Store):
+            elif op == format.STORE:
+                assert isinstance(instr, bytecode.Store)
                 address = resolve_variable(values, instr.address)
                 value = resolve_variable(values, instr.variable)
                 assert isinstance(address, data.UInt)
-                memory[address.n] = value
+                memory.store(address.n, value)
                 pc = retire(values, function, current_block_index, pc, data.void)
-            elif isinstance(instr, bytecode.Get):
+            elif op == format.GET:
                 pc = retire(values, function, current_block_index, pc, coroutine.var)
-            elif isinstance(instr, bytecode.Put):
+            elif op == format.PUT:
+                assert isinstance(instr, bytecode.Put)
                 coroutine.var = resolve_variable(values, instr.variable)
                 pc = retire(values, function, current_block_index, pc, data.void)
-            elif isinstance(instr, bytecode.RunCoroutine):
+            elif op == format.RUN_COROUTINE:
+                assert isinstance(instr, bytecode.RunCoroutine)
                 c = resolve_variable(values, instr.coroutine)
                 assert isinstance(c, Coroutine)
-                coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+                coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
                 coroutine_stack.append(coroutine)
                 coroutine = c
-                frame = coroutine.stack.pop()
+                frame = coroutine.pop_frame()
                 values = frame.values
                 function = frame.function
                 last_block_index = frame.last_block_index
                 current_block_index = frame.current_block_index
                 pc = frame.pc
-            elif isinstance(instr, bytecode.Yield):
+            elif op == format.YIELD:
+                assert isinstance(instr, bytecode.Yield)
                 value = resolve_variable(values, instr.value)
                 if coroutine_stack:
-                    coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+                    coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
                     coroutine = coroutine_stack.pop()
-                    frame = coroutine.stack.pop()
+                    frame = coroutine.pop_frame()
                     values = frame.values
                     function = frame.function
                     last_block_index = frame.last_block_index
@@ -255,16 +440,32 @@ def execute(sys_caller, program, arguments):
                     pc = frame.pc
                     pc = retire(values, function, current_block_index, pc, value)
                 else:
-                    raise Exception('yielded from top level coroutine')
-            elif isinstance(instr, bytecode.Resume):
+                    coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
+                    task = Task(coroutine, coroutine_stack)
+                    task.results = [data.void]
+                    scheduler.schedule(task)
+                    task = scheduler.next_task()
+                    assert task is not None
+                    coroutine = task.coroutine
+                    coroutine_stack = task.coroutine_stack
+                    frame = coroutine.pop_frame()
+                    values = frame.values
+                    function = frame.function
+                    last_block_index = frame.last_block_index
+                    current_block_index = frame.current_block_index
+                    pc = frame.pc
+                    if task.results is not None:
+                        pc = retire_multiple(values, function, current_block_index, pc, task.results)
+            elif op == format.RESUME:
+                assert isinstance(instr, bytecode.Resume)
                 c = resolve_variable(values, instr.coroutine)
                 assert isinstance(c, Coroutine)
                 value = resolve_variable(values, instr.value)
 
-                coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+                coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
                 coroutine_stack.append(coroutine)
                 coroutine = c
-                frame = coroutine.stack.pop()
+                frame = coroutine.pop_frame()
                 values = frame.values
                 function = frame.function
                 last_block_index = frame.last_block_index
@@ -275,11 +476,14 @@ def execute(sys_caller, program, arguments):
                 raise NotImplementedError('missing instruction implementation')
         else:
             term = terminator(function, current_block_index)
-            if isinstance(term, bytecode.Return):
+            op = term.opcode
+            if op == format.RET:
+                assert isinstance(term, bytecode.Return)
                 v = resolve_variable_list(values, term.variables)
 
-                if coroutine.stack:
-                    frame = coroutine.stack.pop()
+                if coroutine.has_frames():
+                    coroutine.release_values(values, function.frame_size)
+                    frame = coroutine.pop_frame()
                     values = frame.values
                     function = frame.function
                     last_block_index = frame.last_block_index
@@ -292,7 +496,7 @@ def execute(sys_caller, program, arguments):
 
                     if coroutine_stack:
                         coroutine = coroutine_stack.pop()
-                        frame = coroutine.stack.pop()
+                        frame = coroutine.pop_frame()
                         values = frame.values
                         function = frame.function
                         last_block_index = frame.last_block_index
@@ -300,24 +504,45 @@ def execute(sys_caller, program, arguments):
                         pc = frame.pc
                         pc = retire(values, function, current_block_index, pc, v[0])
                     else:
-                        return 0
-            elif isinstance(term, bytecode.Goto):
+                        task = scheduler.next_task()
+                        if task is None:
+                            return 0
+                        coroutine = task.coroutine
+                        coroutine_stack = task.coroutine_stack
+                        frame = coroutine.pop_frame()
+                        values = frame.values
+                        function = frame.function
+                        last_block_index = frame.last_block_index
+                        current_block_index = frame.current_block_index
+                        pc = frame.pc
+                        if task.results is not None:
+                            pc = retire_multiple(values, function, current_block_index, pc, task.results)
+            elif op == format.GOTO:
+                assert isinstance(term, bytecode.Goto)
                 last_block_index, current_block_index, pc = goto(function, current_block_index, last_block_index, term.block_index)
-            elif isinstance(term, bytecode.Conditional):
+            elif op == format.CONDITIONAL:
+                assert isinstance(term, bytecode.Conditional)
                 v = resolve_variable(values, term.condition_variable)
                 assert isinstance(v, data.Bool)
                 if v.b:
                     last_block_index, current_block_index, pc = goto(function, current_block_index, last_block_index, term.true_block)
                 else:
                     last_block_index, current_block_index, pc = goto(function, current_block_index, last_block_index, term.false_block)
-            elif isinstance(term, bytecode.CatchFireAndDie):
-                coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+            elif op == format.SWITCH:
+                assert isinstance(term, bytecode.Switch)
+                v = resolve_variable(values, term.variable)
+                assert isinstance(v, data.UInt)
+                last_block_index, current_block_index, pc = goto(function, current_block_index, last_block_index, term.target(v.n))
+            elif op == format.CATCH_FIRE_AND_DIE:
+                coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
                 coroutine.print_backtrace()
                 raise Exception('catching fire and dying')
-            elif isinstance(term, bytecode.Throw):
-                coroutine.stack.append(ActivationFrame(values, function, last_block_index, current_block_index, pc))
+            elif op == format.THROW:
+                assert isinstance(term, bytecode.Throw)
+                coroutine.push_frame(values, function, last_block_index, current_block_index, pc)
                 coroutine.print_backtrace()
                 exception = resolve_variable(values, term.exception)
+                output.flush()
                 print exception
                 raise Exception('throw')
             else:
@@ -0,0 +1,75 @@
+from sys_calls.blocking import WouldBlock
+from sys_calls.epoll import EPoll
+
+# A coroutine together with the coroutines that are running it. Tasks that
+# are waiting to resume hold on to the sys call they're blocked in, or to the
+# results of that sys call once it has been performed.
+class Task(object):
+    def __init__(self, coroutine, coroutine_stack):
+        self.coroutine = coroutine
+        self.coroutine_stack = coroutine_stack
+        self.handler = None
+        self.arguments = None
+        self.results = None
+
+class Scheduler(object):
+    def __init__(self, sys_caller):
+        self.sys_caller = sys_caller
+        self.ready = []
+        self.waiting = {}
+        self.events = {}
+        self.epoll = None
+
+    def spawn(self, coroutine):
+        self.sys_caller.cooperate()
+        self.ready.append(Task(coroutine, []))
+
+    def schedule(self, task):
+        self.ready.append(task)
+
+    def park(self, task, fd, events):
+        if self.epoll is None:
+            self.epoll = EPoll()
+        if fd in self.waiting:
+            self.waiting[fd].append(task)
+            if self.events[fd] | events != self.events[fd]:
+                self.events[fd] |= events
+                self.epoll.modify_fd(fd, self.events[fd])
+        else:
+            self.waiting[fd] = [task]
+            self.events[fd] = events
+            self.epoll.register_fd(fd, events)
+
+    def perform(self, task):
+        handler = task.handler
+        task.handler = None
+        try:
+            task.results = self.sys_caller.sys_call(handler, task.arguments)
+        except WouldBlock as e:
+            task.handler = handler
+            self.park(task, e.fd, e.events)
+            return False
+        task.arguments = None
+        return True
+
+    def wake(self, timeout):
+        for i in xrange(self.epoll.wait(timeout)):
+            fd = self.epoll.event_fd(i)
+            if fd in self.waiting:
+                self.epoll.unregister_fd(fd)
+                self.ready.extend(self.waiting[fd])
+                del self.waiting[fd]
+                del self.events[fd]
+
+    # Returns the next task that can run, waiting for parked tasks to become
+    # ready if there are none, or None once every task has finished.
+    def next_task(self):
+        while True:
+            if self.waiting:
+                self.wake(0 if self.ready else -1)
+            while self.ready:
+                task = self.ready.pop(0)
+                if task.handler is None or self.perform(task):
+                    return task
+            if not self.waiting:
+                return None
@@ -6,7 +6,7 @@ def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.Byte)
     assert isinstance(y, data.Byte)
-    return [data.Bool(x.b == y.b)]
+    return [data.new_bool(x.b == y.b)]
 
 @operator('byte.to_bytestring')
 def call(self, arguments):
@@ -20,7 +20,7 @@ def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.Byte)
-    return [data.UInt(ord(x.b[0]))]
+    return [data.new_uint(ord(x.b[0]))]
 
 @operator('byte.from_uint')
 def call(self, arguments):
@@ -1,51 +1,52 @@
 import data
 from data import operator
+from rpython.rlib.rarithmetic import intmask
 
 @operator('bytestring.head')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.ByteString)
-    assert len(x.v) > 0
-    return [data.Byte(x.v[0])]
+    assert x.length() > 0
+    return [data.Byte(x.byte_at(0))]
 
 @operator('bytestring.drop')
 def call(self, arguments):
     x, n = arguments
     assert isinstance(x, data.ByteString)
     assert isinstance(n, data.UInt)
-    assert len(x.v) >= n.n
-    return [data.ByteString(x.v[n.n:])]
+    assert x.length() >= n.n
+    return [x.slice(intmask(n.n), x.length())]
 
 @operator('bytestring.take')
 def call(self, arguments):
     x, n = arguments
     assert isinstance(x, data.ByteString)
     assert isinstance(n, data.UInt)
-    assert len(x.v) >= n.n
-    return [data.ByteString(x.v[:n.n])]
+    assert x.length() >= n.n
+    return [x.slice(0, intmask(n.n))]
 
 @operator('bytestring.eq')
 def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.ByteString)
     assert isinstance(y, data.ByteString)
-    return [data.Bool(x.v == y.v)]
+    return [data.new_bool(x.eq(y))]
 
 @operator('bytestring.decode_utf8')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.ByteString)
-    return [data.String(x.v.decode('utf-8'))]
+    return [data.String(x.value().decode('utf-8'))]
 
 @operator('bytestring.index')
 def call(self, arguments):
     string, index = arguments
     assert isinstance(string, data.ByteString)
     assert isinstance(index, data.UInt)
-    assert len(string.v) > index.n
-    return [data.Byte(string.v[index.n])]
+    assert string.length() > index.n
+    return [data.Byte(string.byte_at(intmask(index.n)))]
 
 @operator('bytestring.slice')
 def call(self, arguments):
@@ -53,11 +54,16 @@ def call(self, arguments):
     assert isinstance(string, data.ByteString)
     assert isinstance(start, data.UInt)
     assert isinstance(stop, data.UInt)
-    return [data.ByteString(string.v[start.n:stop.n])]
+    length = string.length()
+    start_n = min(intmask(start.n), length)
+    stop_n = min(intmask(stop.n), length)
+    if stop_n < start_n:
+        stop_n = start_n
+    return [string.slice(start_n, stop_n)]
 
 @operator('bytestring.length')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.ByteString)
-    return [data.UInt(len(x.v))]
+    return [data.new_uint(x.length())]
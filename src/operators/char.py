@@ -6,7 +6,7 @@ def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.Char)
     assert isinstance(y, data.Char)
-    return [data.Bool(x.b == y.b)]
+    return [data.new_bool(x.b == y.b)]
 
 @operator('char.to_string')
 def call(self, arguments):
@@ -25,28 +25,28 @@ def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.Char)
-    return [data.Bool(x.b in lowers)]
+    return [data.new_bool(x.b in lowers)]
 
 @operator('char.is_upper')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.Char)
-    return [data.Bool(x.b in uppers)]
+    return [data.new_bool(x.b in uppers)]
 
 @operator('char.is_digit')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.Char)
-    return [data.Bool(x.b in digits)]
+    return [data.new_bool(x.b in digits)]
 
 @operator('char.is_space')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.Char)
-    return [data.Bool(x.b in spaces)]
+    return [data.new_bool(x.b in spaces)]
 
 @operator('char.from_uint')
 def call(self, arguments):
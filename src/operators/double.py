@@ -44,7 +44,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d > b.d)]
+    return [data.new_bool(a.d > b.d)]
 
 @operator('double.lt')
 def call(self, arguments):
@@ -53,7 +53,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d < b.d)]
+    return [data.new_bool(a.d < b.d)]
 
 @operator('double.ge')
 def call(self, arguments):
@@ -62,7 +62,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d >= b.d)]
+    return [data.new_bool(a.d >= b.d)]
 
 @operator('double.le')
 def call(self, arguments):
@@ -71,7 +71,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d <= b.d)]
+    return [data.new_bool(a.d <= b.d)]
 
 @operator('double.eq')
 def call(self, arguments):
@@ -80,7 +80,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d == b.d)]
+    return [data.new_bool(a.d == b.d)]
 
 @operator('double.ne')
 def call(self, arguments):
@@ -89,7 +89,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Double):
         raise TypeError()
-    return [data.Bool(a.d != b.d)]
+    return [data.new_bool(a.d != b.d)]
 
 @operator('double.to_string')
 def call(self, arguments):
@@ -1,15 +1,7 @@
-from rpython.rlib.objectmodel import r_dict
 import data
+import operators.list
 from data import operator
-
-def data_eq(a, b):
-    return a.eq(b)
-
-def data_hash(a):
-    return a.hash()
-
-def empty():
-    return r_dict(data_eq, data_hash)
+from persistent import hashmap
 
 class DHashMap(data.Data):
     def __init__(self, h):
@@ -18,29 +10,44 @@ class DHashMap(data.Data):
 @operator('hashmap.empty')
 def call(self, arguments):
     assert len(arguments) == 0
-    return [DHashMap(empty())]
+    return [DHashMap(hashmap.empty)]
 
 @operator('hashmap.set')
 def call(self, arguments):
     map, key, value = arguments
     assert isinstance(map, DHashMap)
-    updated_map = empty()
-    updated_map.update(map.h)
-    updated_map[key] = value
-    return [DHashMap(updated_map)]
+    return [DHashMap(map.h.set(key, value))]
 
 @operator('hashmap.get')
 def call(self, arguments):
     map, key = arguments
     assert isinstance(map, DHashMap)
-    return [map.h[key]]
+    return [map.h.get(key)]
 
 @operator('hashmap.del')
 def call(self, arguments):
     map, key = arguments
     assert isinstance(map, DHashMap)
-    updated_map = empty()
-    updated_map.update(map.h)
-    del updated_map[key]
-    return [DHashMap(updated_map)]
+    return [DHashMap(map.h.delete(key))]
+
+@operator('hashmap.size')
+def call(self, arguments):
+    assert len(arguments) == 1
+    map = arguments[0]
+    assert isinstance(map, DHashMap)
+    size = map.h.size
+    assert size >= 0
+    return [data.new_uint(size)]
+
+@operator('hashmap.contains')
+def call(self, arguments):
+    map, key = arguments
+    assert isinstance(map, DHashMap)
+    return [data.new_bool(map.h.contains(key))]
 
+@operator('hashmap.keys')
+def call(self, arguments):
+    assert len(arguments) == 1
+    map = arguments[0]
+    assert isinstance(map, DHashMap)
+    return [operators.list.from_list(map.h.keys())]
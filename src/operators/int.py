@@ -8,7 +8,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Int(a.n + b.n)]
+    return [data.new_int(a.n + b.n)]
 
 @operator('int.sub')
 def call(self, arguments):
@@ -17,7 +17,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Int(a.n - b.n)]
+    return [data.new_int(a.n - b.n)]
 
 @operator('int.mul')
 def call(self, arguments):
@@ -26,7 +26,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Int(a.n * b.n)]
+    return [data.new_int(a.n * b.n)]
 
 @operator('int.div')
 def call(self, arguments):
@@ -35,7 +35,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Int(a.n / b.n)]
+    return [data.new_int(a.n / b.n)]
 
 @operator('int.gt')
 def call(self, arguments):
@@ -44,7 +44,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n > b.n)]
+    return [data.new_bool(a.n > b.n)]
 
 @operator('int.lt')
 def call(self, arguments):
@@ -53,7 +53,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n < b.n)]
+    return [data.new_bool(a.n < b.n)]
 
 @operator('int.ge')
 def call(self, arguments):
@@ -62,7 +62,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n >= b.n)]
+    return [data.new_bool(a.n >= b.n)]
 
 @operator('int.le')
 def call(self, arguments):
@@ -71,7 +71,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n <= b.n)]
+    return [data.new_bool(a.n <= b.n)]
 
 @operator('int.eq')
 def call(self, arguments):
@@ -80,7 +80,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n == b.n)]
+    return [data.new_bool(a.n == b.n)]
 
 @operator('int.ne')
 def call(self, arguments):
@@ -89,7 +89,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.Int):
         raise TypeError()
-    return [data.Bool(a.n != b.n)]
+    return [data.new_bool(a.n != b.n)]
 
 @operator('int.to_string')
 def call(self, arguments):
@@ -105,5 +105,5 @@ def call(self, arguments):
     x = arguments[0]
     if not isinstance(x, data.String):
         raise TypeError()
-    return [data.Int(int(x.v))]
+    return [data.new_int(int(x.value()))]
 
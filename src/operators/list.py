@@ -1,23 +1,37 @@
 import data
 from data import operator
+from persistent import vector
+from rpython.rlib.rarithmetic import intmask
 
 class DList(data.Data):
     def debug(self):
-        return u'[%s]' % u', '.join([el.debug() for el in self.elements])
+        return u'[%s]' % u', '.join([el.debug() for el in self.to_list()])
 
     def __init__(self, elements):
         self.elements = elements
 
+    def length(self):
+        return self.elements.length()
+
+    def get(self, i):
+        return self.elements.get(i)
+
+    def to_list(self):
+        return self.elements.to_list()
+
+def from_list(elements):
+    return DList(vector.from_list(elements))
+
 @operator('list.pack')
 def call(self, arguments):
-    return [DList(arguments)]
+    return [from_list(arguments)]
 
 @operator('list.append')
 def call(self, arguments):
     list, element = arguments
     if not isinstance(list, DList):
         raise TypeError()
-    return [DList(list.elements + [element])]
+    return [DList(list.elements.append(element))]
 
 @operator('list.extend')
 def call(self, arguments):
@@ -26,14 +40,14 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, DList):
         raise TypeError()
-    return [DList(a.elements + b.elements)]
+    return [DList(a.elements.extend(b.elements))]
 
 @operator('list.repeat')
 def call(self, arguments):
     element, n = arguments
     if not isinstance(n, data.UInt):
         raise TypeError()
-    return [DList([element] * n.n)]
+    return [from_list([element] * n.n)]
 
 @operator('list.set')
 def call(self, arguments):
@@ -44,58 +58,64 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(index, data.UInt):
         raise TypeError()
-    if index_n < 0 or index_n >= len(list.elements):
+    if index_n < 0 or index_n >= list.length():
         raise IndexError()
-    return [DList(list.elements[:index_n] + [value] + list.elements[index_n+1:])]
+    return [DList(list.elements.set(intmask(index_n), value))]
 
 @operator('list.index')
 def call(self, arguments):
     list, index = arguments
-    if not isinstance(list, DList):
-        raise TypeError()
     if not isinstance(index, data.UInt):
         raise TypeError()
-    if index.n < 0 or index.n >= len(list.elements):
+    # Bytecode from before format version 5 reads the pairs that list.pop
+    # returns with list.index.
+    if isinstance(list, data.Tuple):
+        if index.n >= list.length():
+            raise IndexError()
+        return [list.get(intmask(index.n))]
+    if not isinstance(list, DList):
+        raise TypeError()
+    if index.n < 0 or index.n >= list.length():
         raise IndexError()
-    return [list.elements[index.n]]
+    return [list.get(intmask(index.n))]
 
 @operator('list.length')
 def call(self, arguments):
     assert len(arguments) == 1
     list = arguments[0]
     assert isinstance(list, DList)
-    return [data.UInt(len(list.elements))]
+    return [data.new_uint(list.length())]
 
 @operator('list.reverse')
 def call(self, arguments):
     assert len(arguments) == 1
     l = arguments[0]
     assert isinstance(l, DList)
-    l = list(l.elements)
+    l = l.to_list()
     l.reverse()
-    return [DList(l)]
+    return [from_list(l)]
 
 @operator('list.drop')
 def call(self, arguments):
     l, n = arguments
     assert isinstance(l, DList)
     assert isinstance(n, data.UInt)
-    assert len(l.elements) >= n.n
-    return [DList(l.elements[n.n:])]
+    assert l.length() >= n.n
+    return [from_list(l.to_list()[n.n:])]
 
 @operator('list.take')
 def call(self, arguments):
     l, n = arguments
     assert isinstance(l, DList)
     assert isinstance(n, data.UInt)
-    assert len(l.elements) >= n.n
-    return [DList(l.elements[:n.n])]
+    assert l.length() >= n.n
+    return [from_list(l.to_list()[:n.n])]
 
 @operator('list.pop')
 def call(self, arguments):
     assert len(arguments) == 1
     l = arguments[0]
     assert isinstance(l, DList)
-    l = list(l.elements)
-    v = l.pop()
-    return [DList([DList(l), v])]
+    assert l.length() > 0
+    v = l.get(l.length() - 1)
+    return [data.Tuple([DList(l.elements.pop()), v])]
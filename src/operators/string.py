@@ -1,73 +1,74 @@
 import data
 import operators.list
 from data import operator
+from rpython.rlib.rarithmetic import intmask
 
 @operator('string.length')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.String)
-    return [data.UInt(len(x.v))]
+    return [data.new_uint(x.length())]
 
 @operator('string.concat')
 def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.String)
     assert isinstance(y, data.String)
-    return [data.String(x.v + y.v)]
+    return [data.String(x.value() + y.value())]
 
 @operator('string.head')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.String)
-    assert len(x.v) > 0
-    return [data.Char(x.v[0])]
+    assert x.length() > 0
+    return [data.Char(x.char_at(0))]
 
 @operator('string.tail')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.String)
-    assert len(x.v) > 0
-    return [data.String(x.v[1:])]
+    assert x.length() > 0
+    return [x.slice(1, x.length())]
 
 @operator('string.drop')
 def call(self, arguments):
     x, n = arguments
     assert isinstance(x, data.String)
     assert isinstance(n, data.UInt)
-    assert len(x.v) >= n.n
-    return [data.String(x.v[n.n:])]
+    assert x.length() >= n.n
+    return [x.slice(intmask(n.n), x.length())]
 
 @operator('string.take')
 def call(self, arguments):
     x, n = arguments
     assert isinstance(x, data.String)
     assert isinstance(n, data.UInt)
-    assert len(x.v) >= n.n
-    return [data.String(x.v[:n.n])]
+    assert x.length() >= n.n
+    return [x.slice(0, intmask(n.n))]
 
 @operator('string.eq')
 def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.String)
     assert isinstance(y, data.String)
-    return [data.Bool(x.v == y.v)]
+    return [data.new_bool(x.eq(y))]
 
 @operator('string.ne')
 def call(self, arguments):
     x, y = arguments
     assert isinstance(x, data.String)
     assert isinstance(y, data.String)
-    return [data.Bool(x.v != y.v)]
+    return [data.new_bool(not x.eq(y))]
 
 @operator('string.encode_utf8')
 def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.String)
-    return [data.ByteString(x.v.encode('utf-8'))]
+    return [data.ByteString(x.value().encode('utf-8'))]
 
 @operator('string.pack')
 def call(self, arguments):
@@ -75,7 +76,7 @@ def call(self, arguments):
     x = arguments[0]
     assert isinstance(x, operators.list.DList)
     chars = []
-    for c in x.elements:
+    for c in x.to_list():
         assert isinstance(c, data.Char)
         chars.append(c.b)
     return [data.String(u''.join(chars))]
@@ -85,4 +86,4 @@ def call(self, arguments):
     assert len(arguments) == 1
     x = arguments[0]
     assert isinstance(x, data.String)
-    return [operators.list.DList([data.Char(c) for c in x.v])]
+    return [operators.list.from_list([data.Char(c) for c in x.value()])]
@@ -9,7 +9,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.UInt(a.n + b.n)]
+    return [data.new_uint(a.n + b.n)]
 
 @operator('uint.sub')
 def call(self, arguments):
@@ -18,7 +18,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.UInt(a.n - b.n)]
+    return [data.new_uint(a.n - b.n)]
 
 @operator('uint.mul')
 def call(self, arguments):
@@ -27,7 +27,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.UInt(a.n * b.n)]
+    return [data.new_uint(a.n * b.n)]
 
 @operator('uint.div')
 def call(self, arguments):
@@ -36,7 +36,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.UInt(a.n / b.n)]
+    return [data.new_uint(a.n / b.n)]
 
 @operator('uint.gt')
 def call(self, arguments):
@@ -45,7 +45,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n > b.n)]
+    return [data.new_bool(a.n > b.n)]
 
 @operator('uint.lt')
 def call(self, arguments):
@@ -54,7 +54,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n < b.n)]
+    return [data.new_bool(a.n < b.n)]
 
 @operator('uint.ge')
 def call(self, arguments):
@@ -63,7 +63,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n >= b.n)]
+    return [data.new_bool(a.n >= b.n)]
 
 @operator('uint.le')
 def call(self, arguments):
@@ -72,7 +72,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n <= b.n)]
+    return [data.new_bool(a.n <= b.n)]
 
 @operator('uint.eq')
 def call(self, arguments):
@@ -81,7 +81,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n == b.n)]
+    return [data.new_bool(a.n == b.n)]
 
 @operator('uint.ne')
 def call(self, arguments):
@@ -90,7 +90,7 @@ def call(self, arguments):
         raise TypeError()
     if not isinstance(b, data.UInt):
         raise TypeError()
-    return [data.Bool(a.n != b.n)]
+    return [data.new_bool(a.n != b.n)]
 
 @operator('uint.to_string')
 def call(self, arguments):
@@ -107,20 +107,20 @@ def call(self, arguments):
     if not isinstance(x, data.String):
         raise TypeError()
     n = 0
-    for c in x.v:
+    for c in x.value():
         n *= 10
         c = ord(c)
         assert c >= ord('0') and c <= ord('9')
         c = c - ord('0')
         assert c >= 0
         n += c
-    return [data.UInt(n)]
+    return [data.new_uint(n)]
 
 @operator('unpack_uint')
 def call(self, arguments):
     assert len(arguments) == 1
     b = arguments[0]
     assert isinstance(b, data.ByteString)
-    assert len(b.v) == 8
-    return [data.UInt(runpack('>Q', b.v))]
+    assert b.length() == 8
+    return [data.UInt(runpack('>Q', b.value()))]
 
@@ -0,0 +1,195 @@
+from rpython.rlib.objectmodel import specialize
+
+BITS = 5
+MASK = (1 << BITS) - 1
+
+def bit_count(n):
+    n = n - ((n >> 1) & 0x55555555)
+    n = (n & 0x33333333) + ((n >> 2) & 0x33333333)
+    n = (n + (n >> 4)) & 0x0f0f0f0f
+    return ((n * 0x01010101) & 0xffffffff) >> 24
+
+def bit_for(hash, shift):
+    return 1 << ((hash >> shift) & MASK)
+
+def bit_index(bitmap, bit):
+    return bit_count(bitmap & (bit - 1))
+
+# Children and entries are never resized once a node is built, so updates
+# allocate a new list at its final size.
+@specialize.call_location()
+def replaced(items, i, item):
+    result = [None] * len(items)
+    for j in xrange(len(items)):
+        result[j] = items[j]
+    result[i] = item
+    return result
+
+@specialize.call_location()
+def inserted(items, i, item):
+    result = [None] * (len(items) + 1)
+    for j in xrange(i):
+        result[j] = items[j]
+    result[i] = item
+    for j in xrange(i, len(items)):
+        result[j + 1] = items[j]
+    return result
+
+@specialize.call_location()
+def removed(items, i):
+    result = [None] * (len(items) - 1)
+    for j in xrange(i):
+        result[j] = items[j]
+    for j in xrange(i + 1, len(items)):
+        result[j - 1] = items[j]
+    return result
+
+class Node(object):
+    pass
+
+class Bitmap(Node):
+    _immutable_fields_ = ['bitmap', 'children[*]']
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+class Entry(Node):
+    _immutable_fields_ = ['hash', 'key', 'value']
+    def __init__(self, hash, key, value):
+        self.hash = hash
+        self.key = key
+        self.value = value
+
+class Collision(Node):
+    _immutable_fields_ = ['hash', 'entries[*]']
+    def __init__(self, hash, entries):
+        self.hash = hash
+        self.entries = entries
+
+def lookup(node, shift, hash, key):
+    while isinstance(node, Bitmap):
+        bit = bit_for(hash, shift)
+        if not node.bitmap & bit:
+            return None
+        node = node.children[bit_index(node.bitmap, bit)]
+        shift += BITS
+    if isinstance(node, Entry):
+        if node.hash == hash and node.key.eq(key):
+            return node
+        return None
+    assert isinstance(node, Collision)
+    if node.hash == hash:
+        for entry in node.entries:
+            if entry.key.eq(key):
+                return entry
+    return None
+
+def split(shift, node, node_hash, entry):
+    bitmap = Bitmap(bit_for(node_hash, shift), [node])
+    return insert(bitmap, shift, entry)
+
+def insert(node, shift, entry):
+    if isinstance(node, Bitmap):
+        bit = bit_for(entry.hash, shift)
+        i = bit_index(node.bitmap, bit)
+        if node.bitmap & bit:
+            child = insert(node.children[i], shift + BITS, entry)
+            return Bitmap(node.bitmap, replaced(node.children, i, child))
+        return Bitmap(node.bitmap | bit, inserted(node.children, i, entry))
+    elif isinstance(node, Entry):
+        if node.hash != entry.hash:
+            return split(shift, node, node.hash, entry)
+        if node.key.eq(entry.key):
+            return entry
+        return Collision(node.hash, [node, entry])
+    else:
+        assert isinstance(node, Collision)
+        if node.hash != entry.hash:
+            return split(shift, node, node.hash, entry)
+        entries = node.entries
+        for i in xrange(len(entries)):
+            if entries[i].key.eq(entry.key):
+                return Collision(node.hash, replaced(entries, i, entry))
+        return Collision(node.hash, inserted(entries, len(entries), entry))
+
+# Assumes the key is present. Returns None when the node becomes empty, and
+# collapses branches that are left holding a single entry.
+def remove(node, shift, hash, key):
+    if isinstance(node, Bitmap):
+        bit = bit_for(hash, shift)
+        i = bit_index(node.bitmap, bit)
+        child = remove(node.children[i], shift + BITS, hash, key)
+        bitmap = node.bitmap
+        if child is None:
+            children = removed(node.children, i)
+            bitmap ^= bit
+        else:
+            children = replaced(node.children, i, child)
+        if len(children) == 0:
+            return None
+        if len(children) == 1 and not isinstance(children[0], Bitmap):
+            return children[0]
+        return Bitmap(bitmap, children)
+    elif isinstance(node, Entry):
+        return None
+    else:
+        assert isinstance(node, Collision)
+        entries = node.entries
+        for i in xrange(len(entries)):
+            if entries[i].key.eq(key):
+                entries = removed(entries, i)
+                break
+        if len(entries) == 1:
+            return entries[0]
+        return Collision(node.hash, entries)
+
+def collect_keys(node, keys):
+    if isinstance(node, Bitmap):
+        for child in node.children:
+            collect_keys(child, keys)
+    elif isinstance(node, Entry):
+        keys.append(node.key)
+    else:
+        assert isinstance(node, Collision)
+        for entry in node.entries:
+            keys.append(entry.key)
+
+# A hash array mapped trie keyed on Data.hash and Data.eq. Updates copy one
+# path from the root, so older maps remain valid.
+class HashMap(object):
+    _immutable_fields_ = ['size', 'root']
+    def __init__(self, size, root):
+        self.size = size
+        self.root = root
+
+    def get(self, key):
+        entry = lookup(self.root, 0, key.hash(), key)
+        if entry is None:
+            raise KeyError()
+        return entry.value
+
+    def contains(self, key):
+        return lookup(self.root, 0, key.hash(), key) is not None
+
+    def set(self, key, value):
+        hash = key.hash()
+        size = self.size
+        if lookup(self.root, 0, hash, key) is None:
+            size += 1
+        return HashMap(size, insert(self.root, 0, Entry(hash, key, value)))
+
+    def delete(self, key):
+        hash = key.hash()
+        if lookup(self.root, 0, hash, key) is None:
+            raise KeyError()
+        root = remove(self.root, 0, hash, key)
+        if root is None:
+            return empty
+        return HashMap(self.size - 1, root)
+
+    def keys(self):
+        keys = []
+        collect_keys(self.root, keys)
+        return keys
+
+empty = HashMap(0, Bitmap(0, []))
@@ -0,0 +1,199 @@
+from rpython.rlib.objectmodel import specialize
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+class Node(object):
+    pass
+
+class Branch(Node):
+    _immutable_fields_ = ['children[*]']
+    def __init__(self, children):
+        self.children = children
+
+class Leaf(Node):
+    _immutable_fields_ = ['values[*]']
+    def __init__(self, values):
+        assert len(values) == WIDTH
+        self.values = values
+
+# Nodes and tails are never resized once they're built, so every new one is
+# allocated at its final size and filled from items[start:start + size].
+@specialize.call_location()
+def copy(items, start, size):
+    assert start >= 0
+    assert size >= 0
+    result = [None] * size
+    n = min(size, len(items) - start)
+    for i in xrange(n):
+        result[i] = items[start + i]
+    return result
+
+def new_path(level, node):
+    if level == 0:
+        return node
+    return Branch([new_path(level - BITS, node)])
+
+def push_leaf(level, parent, index, leaf):
+    assert isinstance(parent, Branch)
+    subidx = (index >> level) & MASK
+    n = len(parent.children)
+    if level == BITS:
+        assert subidx == n
+        children = copy(parent.children, 0, n + 1)
+        children[n] = leaf
+    elif subidx < n:
+        children = copy(parent.children, 0, n)
+        children[subidx] = push_leaf(level - BITS, children[subidx], index, leaf)
+    else:
+        children = copy(parent.children, 0, n + 1)
+        children[n] = new_path(level - BITS, leaf)
+    return Branch(children)
+
+def pop_leaf(level, node, index):
+    assert isinstance(node, Branch)
+    subidx = (index >> level) & MASK
+    if level > BITS:
+        child = pop_leaf(level - BITS, node.children[subidx], index)
+        if child is not None:
+            children = copy(node.children, 0, subidx + 1)
+            children[subidx] = child
+            return Branch(children)
+    if subidx == 0:
+        return None
+    return Branch(copy(node.children, 0, subidx))
+
+def assoc(level, node, index, value):
+    if level == 0:
+        assert isinstance(node, Leaf)
+        values = copy(node.values, 0, WIDTH)
+        values[index & MASK] = value
+        return Leaf(values)
+    assert isinstance(node, Branch)
+    subidx = (index >> level) & MASK
+    children = copy(node.children, 0, len(node.children))
+    children[subidx] = assoc(level - BITS, children[subidx], index, value)
+    return Branch(children)
+
+def collect(level, node, output):
+    if level == 0:
+        assert isinstance(node, Leaf)
+        output.extend(node.values)
+    else:
+        assert isinstance(node, Branch)
+        for child in node.children:
+            collect(level - BITS, child, output)
+
+# A 32-way trie of full leaves plus a tail of up to 32 elements. Updates copy
+# a single path, so every version stays valid and shares structure.
+class Vector(object):
+    _immutable_fields_ = ['count', 'shift', 'root', 'tail[*]']
+    def __init__(self, count, shift, root, tail):
+        self.count = count
+        self.shift = shift
+        self.root = root
+        self.tail = tail
+
+    def length(self):
+        count = self.count
+        assert count >= 0
+        return count
+
+    def tail_offset(self):
+        return self.count - len(self.tail)
+
+    def get(self, i):
+        assert i >= 0 and i < self.count
+        offset = self.tail_offset()
+        if i >= offset:
+            return self.tail[i - offset]
+        node = self.root
+        level = self.shift
+        while level > 0:
+            assert isinstance(node, Branch)
+            node = node.children[(i >> level) & MASK]
+            level -= BITS
+        assert isinstance(node, Leaf)
+        return node.values[i & MASK]
+
+    def push_tail(self):
+        offset = self.tail_offset()
+        leaf = Leaf(self.tail)
+        root = self.root
+        shift = self.shift
+        if (offset >> BITS) >= (1 << shift):
+            root = Branch([root, new_path(shift, leaf)])
+            shift += BITS
+        else:
+            root = push_leaf(shift, root, offset, leaf)
+        return Vector(self.count, shift, root, [])
+
+    def append(self, value):
+        v = self
+        if len(v.tail) == WIDTH:
+            v = v.push_tail()
+        n = len(v.tail)
+        tail = copy(v.tail, 0, n + 1)
+        tail[n] = value
+        return Vector(v.count + 1, v.shift, v.root, tail)
+
+    def set(self, i, value):
+        assert i >= 0 and i < self.count
+        offset = self.tail_offset()
+        if i >= offset:
+            tail = copy(self.tail, 0, len(self.tail))
+            tail[i - offset] = value
+            return Vector(self.count, self.shift, self.root, tail)
+        root = assoc(self.shift, self.root, i, value)
+        return Vector(self.count, self.shift, root, self.tail)
+
+    def pop(self):
+        assert self.count > 0
+        n = len(self.tail)
+        if n > 0:
+            return Vector(self.count - 1, self.shift, self.root, copy(self.tail, 0, n - 1))
+
+        index = self.count - WIDTH
+        node = self.root
+        level = self.shift
+        while level > 0:
+            assert isinstance(node, Branch)
+            node = node.children[(index >> level) & MASK]
+            level -= BITS
+        assert isinstance(node, Leaf)
+        tail = copy(node.values, 0, WIDTH - 1)
+
+        branch = pop_leaf(self.shift, self.root, index)
+        shift = self.shift
+        if branch is None:
+            return Vector(self.count - 1, BITS, Branch([]), tail)
+        elif shift > BITS and len(branch.children) == 1:
+            return Vector(self.count - 1, shift - BITS, branch.children[0], tail)
+        return Vector(self.count - 1, shift, branch, tail)
+
+    def extend(self, other):
+        if self.count == 0:
+            return other
+        v = self
+        for value in other.to_list():
+            v = v.append(value)
+        return v
+
+    def to_list(self):
+        output = []
+        collect(self.shift, self.root, output)
+        output.extend(self.tail)
+        return output
+
+empty = Vector(0, BITS, Branch([]), [])
+
+def from_list(elements):
+    v = empty
+    n = len(elements)
+    start = 0
+    while n - start > WIDTH:
+        v = Vector(v.count + WIDTH, v.shift, v.root, copy(elements, start, WIDTH))
+        v = v.push_tail()
+        start += WIDTH
+    return Vector(n, v.shift, v.root, copy(elements, start, n - start))
@@ -1,5 +1,6 @@
 import data
 import sys_calls.ffi
+import sys_calls.buffer
 import sys_calls.stdout
 import sys_calls.socket
 import sys_calls.epoll
@@ -7,28 +8,45 @@ import sys_calls.file
 from rpython.rlib.rstruct.runpack import runpack
 from rpython.rlib.rarithmetic import r_longlong, r_ulonglong, r_int, intmask
 
+bytecode_file = data.BuiltinSysCall('bytecode_file')
+
 class SysCallInterface(object):
-    def sys_call(self, name, arguments):
+    def sys_call(self, handler, arguments):
         raise NotImplementedError()
 
+    # Called once the scheduler has more than one coroutine to run. From then
+    # on, sys calls that would block raise WouldBlock instead.
+    def cooperate(self):
+        pass
+
 class Perform(SysCallInterface):
     def __init__(self, program):
         self.program = program
+        self.cooperative = False
 
-    def sys_call(self, name, arguments):
-        if name == 'bytecode_file':
+    def cooperate(self):
+        self.cooperative = True
+
+    def sys_call(self, handler, arguments):
+        if handler is bytecode_file:
             assert len(arguments) == 0
             return [data.ByteString(self.program)]
         else:
-            return data.sys_calls[name].call(arguments)
+            if self.cooperative:
+                handler.wait(arguments)
+            return handler.call(arguments)
 
 class TraceProxy(SysCallInterface):
     def __init__(self, target, fd):
         self.target = target
         self.fd = fd
 
-    def sys_call(self, name, arguments):
-        values = self.target.sys_call(name, arguments)
+    def cooperate(self):
+        self.target.cooperate()
+
+    def sys_call(self, handler, arguments):
+        values = self.target.sys_call(handler, arguments)
+        name = handler.name
 
         self.fd.write(data.pack_uint(len(name)))
         self.fd.write(name)
@@ -57,7 +75,8 @@ class Replay(SysCallInterface):
     def __init__(self, fd):
         self.fd = EofFd(fd)
 
-    def sys_call(self, name, arguments):
+    def sys_call(self, handler, arguments):
+        name = handler.name
         n = intmask(runpack('>Q', self.fd.read(8)))
         expected_name = self.fd.read(n)
 
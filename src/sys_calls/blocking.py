@@ -0,0 +1,34 @@
+from rpython.rlib import rpoll
+from sys_calls.buffer import Buffer
+
+READABLE = rpoll.POLLIN
+WRITABLE = rpoll.POLLOUT
+
+# Raised by a sys call that can't make progress without blocking. The
+# executor parks the calling coroutine until the fd is ready for the given
+# events and then performs the sys call again.
+class WouldBlock(Exception):
+    def __init__(self, fd, events):
+        self.fd = fd
+        self.events = events
+
+def wait(fd, events):
+    if not rpoll.poll({fd: events}, 0):
+        raise WouldBlock(fd, events)
+
+# Wait hooks for sys calls whose first argument is the socket or file they
+# read from or write to. The sys caller only runs them once coroutines are
+# being scheduled; until then blocking the whole VM is what we want.
+def readable(self, arguments):
+    wait(arguments[0].fileno(), READABLE)
+
+def writable(self, arguments):
+    wait(arguments[0].fileno(), WRITABLE)
+
+# Reading into a full buffer returns 0 straight away, so there's nothing to
+# wait for.
+def readable_into(self, arguments):
+    buf = arguments[1]
+    assert isinstance(buf, Buffer)
+    if not buf.full():
+        wait(arguments[0].fileno(), READABLE)
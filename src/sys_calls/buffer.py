@@ -0,0 +1,121 @@
+import data
+from data import sys_call
+from rpython.rlib import rgc
+from rpython.rlib.rarithmetic import intmask
+from rpython.rlib.rstruct.runpack import runpack
+from rpython.rtyper.lltypesystem import lltype, rffi
+from rpython.translator.tool.cbuild import ExternalCompilationInfo
+
+c_memmove = rffi.llexternal(
+    'memmove',
+    [rffi.VOIDP, rffi.VOIDP, rffi.SIZE_T],
+    lltype.Void,
+    compilation_info=ExternalCompilationInfo(includes=['string.h']),
+    releasegil=False
+)
+
+# A fixed-capacity byte buffer that reads fill from the end and consumers
+# drain from the front. The bytes live in raw memory, so refilling it doesn't
+# allocate; only the slices taken out of it become ByteStrings. A read into a
+# full buffer reads nothing and returns 0, which callers tell apart from end
+# of file by comparing the length to the capacity.
+class Buffer(data.Data):
+    def __init__(self, capacity):
+        assert capacity > 0
+        self.capacity = capacity
+        self.start = 0
+        self.stop = 0
+        self.raw = lltype.malloc(rffi.CCHARP.TO, capacity, flavor='raw')
+
+    @rgc.must_be_light_finalizer
+    def __del__(self):
+        lltype.free(self.raw, flavor='raw')
+
+    def length(self):
+        length = self.stop - self.start
+        assert length >= 0
+        return length
+
+    def full(self):
+        return self.length() == self.capacity
+
+    # Returns a pointer to, and the size of, the free space at the end of the
+    # buffer, moving the unconsumed bytes to the front first. The size is 0
+    # when the buffer is full.
+    def reserve(self):
+        if self.start > 0:
+            length = self.length()
+            if length > 0:
+                c_memmove(self.raw, rffi.ptradd(self.raw, self.start), length)
+            self.start = 0
+            self.stop = length
+        return rffi.ptradd(self.raw, self.stop), self.capacity - self.stop
+
+    def filled(self, n):
+        assert 0 <= n <= self.capacity - self.stop
+        self.stop += n
+
+    def slice(self, start, stop):
+        assert 0 <= start <= stop <= self.length()
+        return data.ByteString(rffi.charpsize2str(rffi.ptradd(self.raw, self.start + start), stop - start))
+
+    def consume(self, n):
+        assert 0 <= n <= self.length()
+        self.start += n
+        if self.start == self.stop:
+            self.start = 0
+            self.stop = 0
+
+    def persist(self, fd):
+        fd.write(self.type_id)
+        fd.write(data.pack_uint(self.capacity))
+
+    @staticmethod
+    def load(fd):
+        n = intmask(runpack('>Q', fd.read(8)))
+        return Buffer(n)
+
+    def __repr__(self):
+        return '(buffer %d/%d)' % (self.length(), self.capacity)
+
+    def eq(self, other):
+        return isinstance(other, Buffer) and self.capacity == other.capacity
+
+@sys_call('buffer_new')
+def call(self, arguments):
+    assert len(arguments) == 1
+    capacity = arguments[0]
+    assert isinstance(capacity, data.UInt)
+    return [Buffer(intmask(capacity.n))]
+
+@sys_call('buffer_length')
+def call(self, arguments):
+    assert len(arguments) == 1
+    buf = arguments[0]
+    assert isinstance(buf, Buffer)
+    return [data.new_uint(buf.length())]
+
+@sys_call('buffer_capacity')
+def call(self, arguments):
+    assert len(arguments) == 1
+    buf = arguments[0]
+    assert isinstance(buf, Buffer)
+    capacity = buf.capacity
+    assert capacity >= 0
+    return [data.new_uint(capacity)]
+
+@sys_call('buffer_slice')
+def call(self, arguments):
+    buf, start, stop = arguments
+    assert isinstance(buf, Buffer)
+    assert isinstance(start, data.UInt)
+    assert isinstance(stop, data.UInt)
+    return [buf.slice(intmask(start.n), intmask(stop.n))]
+
+@sys_call('buffer_consume')
+def call(self, arguments):
+    buf, n = arguments
+    assert isinstance(buf, Buffer)
+    assert isinstance(n, data.UInt)
+    buf.consume(intmask(n.n))
+    return [data.Void()]
@@ -1,7 +1,7 @@
 import data
-import sys_calls.socket as s
 from data import sys_call, expose_constant
-from operators.list import DList
+from sys_calls.file import File
+from sys_calls.socket import Socket
 from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.rtyper.tool import rffi_platform
 from rpython.rlib import _rsocket_rffi, rsocket, rgc
@@ -71,79 +71,163 @@ epoll_wait = rffi.llexternal(
 
 for key, value in public_symbols.iteritems():
     assert value >= 0
-    expose_constant(key, data.UInt(value))
+    expose_constant(key, data.new_uint(value))
 
+DEFAULT_MAXEVENTS = FD_SETSIZE - 1
+
+# The array epoll_wait fills is allocated along with the EPoll and reused by
+# every wait. The results of a wait can be read out of it until the next one.
 class EPoll(data.Data):
-    def __init__(self):
+    def __init__(self, maxevents=DEFAULT_MAXEVENTS):
+        assert maxevents > 0
         self.fd = epoll_create1(0)
-        self.sockets = {}
+        self.registered = {}
         if self.fd < 0:
             raise rsocket.last_error()
+        self.maxevents = maxevents
+        self.events = lltype.malloc(rffi.CArray(epoll_event), maxevents, flavor='raw')
+        self.count = 0
 
     @rgc.must_be_light_finalizer
     def __del__(self):
+        lltype.free(self.events, flavor='raw')
         fd = self.fd
         if fd != _rsocket_rffi.INVALID_SOCKET:
             self.fd = _rsocket_rffi.INVALID_SOCKET
             _rsocket_rffi.socketclose_no_errno(fd)
 
-    def register_sock(self, sock, flags):
-        assert isinstance(sock, s.Socket)
-        assert isinstance(flags, data.UInt)
-        self.sockets[sock.fd] = sock
+    def control(self, op, fd, events):
         with lltype.scoped_alloc(epoll_event) as ev:
-            ev.c_events = rffi.cast(rffi.UINT, flags.n)
-            rffi.setintfield(ev.c_data, 'c_fd', sock.fd)
-            if epoll_ctl(self.fd, EPOLL_CTL_ADD, sock.fd, ev) < 0:
+            ev.c_events = rffi.cast(rffi.UINT, events)
+            rffi.setintfield(ev.c_data, 'c_fd', fd)
+            if epoll_ctl(self.fd, op, fd, ev) < 0:
                 raise rsocket.last_error()
 
-    def unregister_sock(self, sock):
-        assert isinstance(sock, s.Socket)
-        del self.sockets[sock.fd]
-        with lltype.scoped_alloc(epoll_event) as ev:
-            ev.c_events = rffi.cast(rffi.UINT, 0)
-            rffi.setintfield(ev.c_data, 'c_fd', sock.fd)
-            if epoll_ctl(self.fd, EPOLL_CTL_DEL, sock.fd, ev) < 0:
-                raise rsocket.last_error()
+    def register_fd(self, fd, events):
+        self.control(EPOLL_CTL_ADD, fd, events)
 
-    def poll(self):
-        timeout = -1
-        maxevents = FD_SETSIZE - 1
+    def modify_fd(self, fd, events):
+        self.control(EPOLL_CTL_MOD, fd, events)
 
-        with lltype.scoped_alloc(rffi.CArray(epoll_event), maxevents) as evs:
-            nfds = epoll_wait(self.fd, evs, maxevents, timeout)
-            if nfds < 0:
-                raise rsocket.last_error()
+    def unregister_fd(self, fd):
+        self.control(EPOLL_CTL_DEL, fd, 0)
+
+    def fileno(self):
+        return self.fd
+
+    def register_data(self, dat, flags):
+        assert isinstance(flags, data.UInt)
+        fd = dat.fileno()
+        self.register_fd(fd, intmask(flags.n))
+        self.registered[fd] = dat
+
+    def modify_data(self, dat, flags):
+        assert isinstance(flags, data.UInt)
+        fd = dat.fileno()
+        assert fd in self.registered
+        self.modify_fd(fd, intmask(flags.n))
+
+    def unregister_data(self, dat):
+        fd = dat.fileno()
+        self.unregister_fd(fd)
+        del self.registered[fd]
+
+    def wait(self, timeout):
+        nfds = epoll_wait(self.fd, self.events, self.maxevents, timeout)
+        if nfds < 0:
+            self.count = 0
+            raise rsocket.last_error()
+        count = intmask(nfds)
+        assert count >= 0
+        self.count = count
+        return count
 
-            output = [None] * nfds
-            for i in xrange(nfds):
-                event = evs[i]
-                sock = self.sockets[event.c_data.c_fd]
-                output[i] = DList([sock, data.UInt(event.c_events)])
-            return DList(output)
+    def event_fd(self, i):
+        assert 0 <= i < self.count
+        return intmask(self.events[i].c_data.c_fd)
+
+    def event_flags(self, i):
+        assert 0 <= i < self.count
+        flags = intmask(self.events[i].c_events)
+        assert flags >= 0
+        return flags
+
+    def ready(self, i):
+        return self.registered[self.event_fd(i)]
 
 @sys_call('epoll')
 def call(self, arguments):
     assert len(arguments) == 0
     return [EPoll()]
 
-@sys_call('epoll_register')
+@sys_call('epoll_create')
+def call(self, arguments):
+    assert len(arguments) == 1
+    maxevents = arguments[0]
+    assert isinstance(maxevents, data.UInt)
+    return [EPoll(intmask(maxevents.n))]
+
+# Sockets and files each get their own register, modify, unregister and ready
+# sys calls, so the compiler knows the type epoll_ready hands back. Only the fd
+# matters to the EPoll itself.
+def event_sys_calls(suffix, cls):
+    @sys_call('epoll_register' + suffix)
+    def call(self, arguments):
+        epoll, dat, flags = arguments
+        assert isinstance(epoll, EPoll)
+        assert isinstance(dat, cls)
+        epoll.register_data(dat, flags)
+        return [data.Void()]
+
+    @sys_call('epoll_modify' + suffix)
+    def call(self, arguments):
+        epoll, dat, flags = arguments
+        assert isinstance(epoll, EPoll)
+        assert isinstance(dat, cls)
+        epoll.modify_data(dat, flags)
+        return [data.Void()]
+
+    @sys_call('epoll_unregister' + suffix)
+    def call(self, arguments):
+        epoll, dat = arguments
+        assert isinstance(epoll, EPoll)
+        assert isinstance(dat, cls)
+        epoll.unregister_data(dat)
+        return [data.Void()]
+
+    @sys_call('epoll_ready' + suffix)
+    def call(self, arguments):
+        epoll, i = arguments
+        assert isinstance(epoll, EPoll)
+        assert isinstance(i, data.UInt)
+        dat = epoll.ready(intmask(i.n))
+        if not isinstance(dat, cls):
+            raise TypeError()
+        return [dat]
+
+event_sys_calls('', Socket)
+event_sys_calls('_file', File)
+
+# Polling returns how many events are ready. epoll_ready and epoll_flags read
+# what was registered and the event mask of each of them, so a wait doesn't
+# allocate.
+@sys_call('epoll_poll')
 def call(self, arguments):
-    epoll, sock, flags = arguments
+    assert len(arguments) == 1
+    epoll = arguments[0]
     assert isinstance(epoll, EPoll)
-    epoll.register_sock(sock, flags)
-    return [data.Void()]
+    return [data.new_uint(epoll.wait(-1))]
 
-@sys_call('epoll_unregister')
+@sys_call('epoll_poll_timeout')
 def call(self, arguments):
-    epoll, sock = arguments
+    epoll, timeout = arguments
     assert isinstance(epoll, EPoll)
-    epoll.unregister_sock(sock)
-    return [data.Void()]
+    assert isinstance(timeout, data.UInt)
+    return [data.new_uint(epoll.wait(intmask(timeout.n)))]
 
-@sys_call('epoll_poll')
+@sys_call('epoll_flags')
 def call(self, arguments):
-    assert len(arguments) == 1
-    epoll = arguments[0]
+    epoll, i = arguments
     assert isinstance(epoll, EPoll)
-    return [epoll.poll()]
+    assert isinstance(i, data.UInt)
+    return [data.new_uint(epoll.event_flags(intmask(i.n)))]
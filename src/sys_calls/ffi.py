@@ -40,7 +40,7 @@ def call(self, arguments):
     assert len(arguments) == 1
     name = arguments[0]
     assert isinstance(name, data.ByteString)
-    return [DLib(ffi.CDLL(name.v))]
+    return [DLib(ffi.CDLL(name.value()))]
 
 @sys_call('ffi.get_pointer')
 def call(self, arguments):
@@ -51,11 +51,11 @@ def call(self, arguments):
     assert isinstance(ret_type, DType)
     args = []
     copied_types = []
-    for arg_type in arg_types.elements:
+    for arg_type in arg_types.to_list():
         assert isinstance(arg_type, DType)
         args.append(arg_type.ty)
         copied_types.append(arg_type)
-    f = lib.lib.getpointer(name.v, args, ret_type.ty)
+    f = lib.lib.getpointer(name.value(), args, ret_type.ty)
     return [DForeignFunction(f, copied_types, ret_type)]
 
 for name in ffi.base_names:
@@ -69,7 +69,7 @@ def call(self, arguments):
     types = arguments[0]
     assert isinstance(types, DList)
     ffi_types = []
-    for ty in types.elements:
+    for ty in types.to_list():
         assert isinstance(ty, DType)
         ffi_types.append(ty.ty)
     return [DStructType(ffi_types)]
@@ -79,10 +79,10 @@ def call(self, arguments):
     function, args = arguments
     assert isinstance(function, DForeignFunction)
     assert isinstance(args, DList)
-    assert len(function.arg_types) == len(args.elements)
+    assert len(function.arg_types) == args.length()
     for i in xrange(len(function.arg_types)):
         ty = function.arg_types[i]
-        arg = args.elements[i]
+        arg = args.get(i)
         if ty.ty == ffi.ffi_type_pointer:
             assert isinstance(arg, DForeignPtr)
             function.foreign_function.push_arg(arg.ptr)
@@ -96,6 +96,6 @@ def call(self, arguments):
         return [DForeignPtr(ptr)]
     elif function.ret_type.ty == ffi.ffi_type_sint:
         n = function.foreign_function.call(rffi.LONG)
-        return [data.Int(n)]
+        return [data.new_int(n)]
     else:
         raise TypeError()
@@ -3,40 +3,67 @@ import os.path
 import data
 from rpython.rlib.rarithmetic import intmask
 from data import sys_call
+from sys_calls.blocking import readable, readable_into, writable
+from sys_calls.buffer import Buffer
+from sys_calls.vectored import write_list
+from rpython.rlib import rposix
+from rpython.rtyper.lltypesystem import rffi
 
 class File(data.Data):
     def __init__(self, fd):
         self.fd = fd
 
+    def fileno(self):
+        return self.fd
+
 @sys_call('file_exists')
 def call(self, arguments):
     assert len(arguments) == 1
     filename = arguments[0]
     assert isinstance(filename, data.ByteString)
-    return [data.Bool(os.path.isfile(filename.v))]
+    return [data.new_bool(os.path.isfile(filename.value()))]
 
 @sys_call('file_open')
 def call(self, arguments):
     filename, mode = arguments
     assert isinstance(filename, data.ByteString)
     assert isinstance(mode, data.UInt)
-    fd = os.open(filename.v, intmask(mode.n), 0777)
+    fd = os.open(filename.value(), intmask(mode.n), 0777)
     assert fd >= 0
     return [File(fd)]
 
-@sys_call('file_read')
+@sys_call('file_read', wait=readable)
 def call(self, arguments):
     file, n = arguments
     assert isinstance(file, File)
     assert isinstance(n, data.UInt)
     return [data.ByteString(os.read(file.fd, intmask(n.n)))]
 
-@sys_call('file_write')
+@sys_call('file_read_into', wait=readable_into)
+def call(self, arguments):
+    file, buf = arguments
+    assert isinstance(file, File)
+    assert isinstance(buf, Buffer)
+    ptr, size = buf.reserve()
+    if size == 0:
+        return [data.new_uint(0)]
+    n = rposix.handle_posix_error('read', intmask(rposix.c_read(file.fd, rffi.cast(rffi.VOIDP, ptr), size)))
+    buf.filled(n)
+    return [data.new_uint(n)]
+
+@sys_call('file_write', wait=writable)
 def call(self, arguments):
     file, dat = arguments
     assert isinstance(file, File)
     assert isinstance(dat, data.ByteString)
-    os.write(file.fd, dat.v)
+    os.write(file.fd, dat.value())
+    return [data.Void()]
+
+@sys_call('file_write_list', wait=writable)
+def call(self, arguments):
+    file, lst = arguments
+    assert isinstance(file, File)
+    write_list(file.fd, lst)
     return [data.Void()]
 
 @sys_call('file_close')
@@ -1,9 +1,17 @@
 import data
 from data import sys_call, expose_constant
-from rpython.rlib import rsocket
+from sys_calls.blocking import readable, readable_into, writable
+from sys_calls.buffer import Buffer
+from sys_calls.vectored import write_list
+from rpython.rlib import rsocket, _rsocket_rffi
 from rpython.rlib.rarithmetic import intmask, r_ulonglong
 from rpython.rlib.rstruct.runpack import runpack
+from rpython.rtyper.lltypesystem import rffi
 import select
+import errno
+
+def would_block(error):
+    return error.errno == _rsocket_rffi.EWOULDBLOCK or error.errno == errno.EAGAIN
 
 class Socket(data.Data):
     def __init__(self, sock, fd=-1):
@@ -28,6 +36,9 @@ class Socket(data.Data):
     def eq(self, other):
         return isinstance(other, Socket) and self.fd == other.fd
 
+    def fileno(self):
+        return self.fd
+
 @sys_call('socket_socket')
 def call(self, arguments):
     family, type, proto = arguments
@@ -42,7 +53,7 @@ def call(self, arguments):
     assert isinstance(socket, Socket)
     assert isinstance(address, data.String)
     assert isinstance(port, data.UInt)
-    socket.sock.bind(rsocket.INETAddress(address.v.encode('utf-8'), intmask(port.n)))
+    socket.sock.bind(rsocket.INETAddress(address.value().encode('utf-8'), intmask(port.n)))
     return [data.Void()]
 
 @sys_call('socket_listen')
@@ -53,7 +64,7 @@ def call(self, arguments):
     socket.sock.listen(backlog.n)
     return [data.Void()]
 
-@sys_call('socket_accept')
+@sys_call('socket_accept', wait=readable)
 def call(self, arguments):
     assert len(arguments) == 1
     socket = arguments[0]
@@ -61,19 +72,91 @@ def call(self, arguments):
     s, _ = socket.sock.accept()
     return [Socket(rsocket.RSocket(fd=s))]
 
-@sys_call('socket_recv')
+@sys_call('socket_recv', wait=readable)
 def call(self, arguments):
     socket, n = arguments
     assert isinstance(socket, Socket)
     assert isinstance(n, data.UInt)
     return [data.ByteString(socket.sock.recv(intmask(n.n)))]
 
-@sys_call('socket_send')
+@sys_call('socket_recv_into', wait=readable_into)
+def call(self, arguments):
+    socket, buf = arguments
+    assert isinstance(socket, Socket)
+    assert isinstance(buf, Buffer)
+    ptr, size = buf.reserve()
+    if size == 0:
+        return [data.new_uint(0)]
+    n = intmask(_rsocket_rffi.socketrecv(socket.fd, rffi.cast(rffi.VOIDP, ptr), size, 0))
+    if n < 0:
+        raise rsocket.last_error()
+    buf.filled(n)
+    return [data.new_uint(n)]
+
+@sys_call('socket_send', wait=writable)
+def call(self, arguments):
+    socket, dat = arguments
+    assert isinstance(socket, Socket)
+    assert isinstance(dat, data.ByteString)
+    socket.sock.sendall(dat.value())
+    return [data.Void()]
+
+@sys_call('socket_set_nonblocking')
+def call(self, arguments):
+    assert len(arguments) == 1
+    socket = arguments[0]
+    assert isinstance(socket, Socket)
+    socket.sock.setblocking(False)
+    return [data.Void()]
+
+# The connection is returned in non-blocking mode. If no connection is
+# pending, the returned socket is invalid and the flag is true.
+@sys_call('socket_accept_nonblocking')
+def call(self, arguments):
+    assert len(arguments) == 1
+    socket = arguments[0]
+    assert isinstance(socket, Socket)
+    try:
+        s, _ = socket.sock.accept()
+    except rsocket.CSocketError as e:
+        if not would_block(e):
+            raise
+        return [data.Tuple([Socket(None), data.true])]
+    sock = rsocket.RSocket(fd=s)
+    sock.setblocking(False)
+    return [data.Tuple([Socket(sock), data.false])]
+
+@sys_call('socket_recv_some')
+def call(self, arguments):
+    socket, n = arguments
+    assert isinstance(socket, Socket)
+    assert isinstance(n, data.UInt)
+    try:
+        received = socket.sock.recv(intmask(n.n))
+    except rsocket.CSocketError as e:
+        if not would_block(e):
+            raise
+        return [data.Tuple([data.ByteString(''), data.true])]
+    return [data.Tuple([data.ByteString(received), data.false])]
+
+@sys_call('socket_send_some')
 def call(self, arguments):
     socket, dat = arguments
     assert isinstance(socket, Socket)
     assert isinstance(dat, data.ByteString)
-    socket.sock.sendall(dat.v)
+    try:
+        sent = socket.sock.send(dat.value())
+    except rsocket.CSocketError as e:
+        if not would_block(e):
+            raise
+        sent = 0
+    return [data.new_uint(sent)]
+
+@sys_call('socket_send_list', wait=writable)
+def call(self, arguments):
+    socket, lst = arguments
+    assert isinstance(socket, Socket)
+    write_list(socket.fd, lst)
     return [data.Void()]
 
 @sys_call('socket_close')
@@ -1,12 +1,48 @@
+import os
 import data
 from data import sys_call
+from rpython.rlib.rarithmetic import intmask
+
+# Everything the VM prints goes through here. Writes are collected until at
+# least `size` bytes are pending; with the default size of 0 every write goes
+# straight out.
+class Output(object):
+    def __init__(self, fd):
+        self.fd = fd
+        self.size = 0
+        self.pending = []
+        self.length = 0
+
+    def write(self, s):
+        self.pending.append(s)
+        self.length += len(s)
+        if self.length >= self.size:
+            self.flush()
+
+    def flush(self):
+        if self.length == 0:
+            self.pending = []
+            return
+        s = ''.join(self.pending)
+        self.pending = []
+        self.length = 0
+        while s:
+            n = os.write(self.fd, s)
+            s = s[n:]
+
+    def resize(self, size):
+        self.size = size
+        if self.length >= self.size:
+            self.flush()
+
+output = Output(1)
 
 @sys_call('print_string')
 def call(self, arguments):
     assert len(arguments) == 1
     a = arguments[0]
     assert isinstance(a, data.String)
-    print a.v
+    output.write(a.value().encode('utf-8') + '\n')
     return [data.Void()]
 
 @sys_call('print_uint')
@@ -14,7 +50,7 @@ def call(self, arguments):
     assert len(arguments) == 1
     a = arguments[0]
     assert isinstance(a, data.UInt)
-    print a.n
+    output.write(str(a.n) + '\n')
     return [data.Void()]
 
 @sys_call('print_bool')
@@ -23,9 +59,9 @@ def call(self, arguments):
     a = arguments[0]
     assert isinstance(a, data.Bool)
     if a.b:
-        print 'True'
+        output.write('True\n')
     else:
-        print 'False'
+        output.write('False\n')
     return [data.Void()]
 
 @sys_call('print_char')
@@ -33,6 +69,35 @@ def call(self, arguments):
     assert len(arguments) == 1
     a = arguments[0]
     assert isinstance(a, data.Char)
-    print a.b
+    output.write((a.b + u'\n').encode('utf-8'))
+    return [data.Void()]
+
+@sys_call('stdout_write')
+def call(self, arguments):
+    assert len(arguments) == 1
+    a = arguments[0]
+    assert isinstance(a, data.ByteString)
+    output.write(a.value())
+    return [data.Void()]
+
+@sys_call('stdout_write_string')
+def call(self, arguments):
+    assert len(arguments) == 1
+    a = arguments[0]
+    assert isinstance(a, data.String)
+    output.write(a.value().encode('utf-8'))
     return [data.Void()]
 
+@sys_call('stdout_buffer_size')
+def call(self, arguments):
+    assert len(arguments) == 1
+    size = arguments[0]
+    assert isinstance(size, data.UInt)
+    output.resize(intmask(size.n))
+    return [data.Void()]
+
+@sys_call('stdout_flush')
+def call(self, arguments):
+    assert len(arguments) == 0
+    output.flush()
+    return [data.Void()]
@@ -0,0 +1,78 @@
+import data
+from operators.list import DList
+from rpython.rlib import rposix
+from rpython.rtyper.lltypesystem import lltype, rffi
+from rpython.rtyper.tool import rffi_platform
+from rpython.translator.tool.cbuild import ExternalCompilationInfo
+
+eci = ExternalCompilationInfo(
+    includes = ['sys/uio.h', 'limits.h']
+)
+
+class CConfig:
+    _compilation_info_ = eci
+
+CConfig.iovec = rffi_platform.Struct("struct iovec", [
+    ("iov_base", rffi.VOIDP),
+    ("iov_len", rffi.SIZE_T),
+])
+CConfig.IOV_MAX = rffi_platform.DefinedConstantInteger("IOV_MAX")
+
+cconfig = rffi_platform.configure(CConfig)
+
+iovec = cconfig["iovec"]
+IOV_MAX = cconfig["IOV_MAX"] or 1024
+
+c_writev = rffi.llexternal(
+    "writev",
+    [rffi.INT, rffi.CArrayPtr(iovec), rffi.INT],
+    rffi.SSIZE_T,
+    compilation_info=eci,
+    save_err=rffi.RFFI_SAVE_ERRNO
+)
+
+def byte_strings(lst):
+    assert isinstance(lst, DList)
+    pieces = []
+    for piece in lst.to_list():
+        assert isinstance(piece, data.ByteString)
+        if piece.length() > 0:
+            pieces.append(piece)
+    return pieces
+
+# Writes every ByteString in the list to fd with as few writev calls as
+# possible. The iovecs point straight into the strings' buffers, so slices
+# are written without being copied out first.
+def write_list(fd, lst):
+    pieces = byte_strings(lst)
+    count = len(pieces)
+    if count == 0:
+        return
+
+    buffers = [rffi.get_nonmovingbuffer(piece.buf) for piece in pieces]
+    try:
+        with lltype.scoped_alloc(rffi.CArray(iovec), min(count, IOV_MAX)) as iov:
+            i = 0
+            offset = 0
+            while i < count:
+                n = min(count - i, IOV_MAX)
+                for j in xrange(n):
+                    piece = pieces[i + j]
+                    buf, _ = buffers[i + j]
+                    start = piece.start
+                    if j == 0:
+                        start += offset
+                    iov[j].c_iov_base = rffi.cast(rffi.VOIDP, rffi.ptradd(buf, start))
+                    rffi.setintfield(iov[j], 'c_iov_len', piece.stop - start)
+
+                written = rposix.handle_posix_error('writev', c_writev(fd, iov, n))
+
+                written += offset
+                while i < count and written >= pieces[i].length():
+                    written -= pieces[i].length()
+                    i += 1
+                offset = written
+    finally:
+        for i in xrange(count):
+            buf, flag = buffers[i]
+            rffi.free_nonmovingbuffer(pieces[i].buf, buf, flag)